@@ -0,0 +1,406 @@
+"""Render screens for many device sizes in one pass.
+
+A screen is traced once with screen_width and screen_height bound to
+DeviceValues, NumPy arrays holding the value for every device, so each
+coordinate is computed for all devices by one vectorized operation. The
+trace records the drawing calls, which are then replayed into a real
+backend drawing per device with that device's numbers.
+
+When the screen's code branches differently for some devices (a list fits
+more rows, a title needs truncating) or needs a value as a plain number or
+string that differs across devices, the devices are split by that value
+and each group is traced separately. Symbol ids, which digest sizes, are
+computed per device as DeviceTexts rather than splitting. Without NumPy,
+or for a screen that cannot be traced, every device is rendered on its own.
+"""
+import copy
+import re
+from functools import partial
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from stylesheet import StyleSheet
+from screen_registry import drawing_class
+
+SLOT = re.compile('\x00(\\d+)\x00')
+
+# Device profiles as (width, height) in points
+DEVICES = {
+    'wireframe': (360, 640),
+    'iphone-se': (320, 568),
+    'iphone-8': (375, 667),
+    'iphone-8-plus': (414, 736),
+    'iphone-x': (375, 812),
+    'iphone-12': (390, 844),
+    'iphone-14-pro': (393, 852),
+    'iphone-14-pro-max': (430, 932),
+    'pixel-5': (393, 851),
+    'pixel-7': (412, 915),
+    'galaxy-s20': (360, 800),
+    'galaxy-fold': (280, 653),
+    'ipad-mini': (768, 1024),
+    'ipad-air': (820, 1180),
+    'ipad-pro-11': (834, 1194),
+    'ipad-pro-12': (1024, 1366),
+    'galaxy-tab-s7': (800, 1280),
+    'iphone-12-landscape': (844, 390),
+    'pixel-7-landscape': (915, 412),
+    'ipad-air-landscape': (1180, 820),
+    'ipad-pro-12-landscape': (1366, 1024),
+}
+
+
+class Divergence(Exception):
+    """Devices disagree on a value the screen needs as a single scalar"""
+
+    def __init__(self, keys):
+        super().__init__('devices diverge')
+        self.keys = keys
+
+
+def _values(other):
+    return other.values if isinstance(other, DeviceValue) else other
+
+
+class DeviceValue:
+    """A number with one value per device, computed with NumPy"""
+
+    __slots__ = ('values', '_list')
+
+    def __init__(self, values):
+        self.values = np.asarray(values)
+        self._list = None
+
+    def at(self, index):
+        """Plain Python number for one device"""
+        if self._list is None:
+            self._list = self.values.tolist()
+        return self._list[index]
+
+    def scalar(self):
+        """The value shared by every device, or Divergence if they differ"""
+        values = self.values
+        if (values == values[0]).all():
+            return values[0].item()
+        raise Divergence(values)
+
+    def _uniform(self, result):
+        if result.all():
+            return True
+        if not result.any():
+            return False
+        raise Divergence(result)
+
+    # Arithmetic is vectorized across devices
+    def __add__(self, other):
+        return DeviceValue(self.values + _values(other))
+
+    def __radd__(self, other):
+        return DeviceValue(_values(other) + self.values)
+
+    def __sub__(self, other):
+        return DeviceValue(self.values - _values(other))
+
+    def __rsub__(self, other):
+        return DeviceValue(_values(other) - self.values)
+
+    def __mul__(self, other):
+        return DeviceValue(self.values * _values(other))
+
+    def __rmul__(self, other):
+        return DeviceValue(_values(other) * self.values)
+
+    def __truediv__(self, other):
+        return DeviceValue(self.values / _values(other))
+
+    def __rtruediv__(self, other):
+        return DeviceValue(_values(other) / self.values)
+
+    def __floordiv__(self, other):
+        return DeviceValue(self.values // _values(other))
+
+    def __rfloordiv__(self, other):
+        return DeviceValue(_values(other) // self.values)
+
+    def __mod__(self, other):
+        return DeviceValue(self.values % _values(other))
+
+    def __neg__(self):
+        return DeviceValue(-self.values)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return DeviceValue(np.abs(self.values))
+
+    def __ceil__(self):
+        return DeviceValue(np.ceil(self.values).astype(np.int64))
+
+    def __floor__(self):
+        return DeviceValue(np.floor(self.values).astype(np.int64))
+
+    def __round__(self, ndigits=None):
+        if ndigits is None:
+            return DeviceValue(np.round(self.values).astype(np.int64))
+        return DeviceValue(np.round(self.values, ndigits))
+
+    # Comparisons must agree across devices to pick a branch
+    def __lt__(self, other):
+        return self._uniform(self.values < _values(other))
+
+    def __le__(self, other):
+        return self._uniform(self.values <= _values(other))
+
+    def __gt__(self, other):
+        return self._uniform(self.values > _values(other))
+
+    def __ge__(self, other):
+        return self._uniform(self.values >= _values(other))
+
+    def __eq__(self, other):
+        return self._uniform(self.values == _values(other))
+
+    def __ne__(self, other):
+        return self._uniform(self.values != _values(other))
+
+    def __hash__(self):
+        return hash(self.values.tobytes())
+
+    # Anything needing one plain value must get the same one on every device
+    def __bool__(self):
+        return bool(self.scalar())
+
+    def __index__(self):
+        return int(self.scalar())
+
+    def __int__(self):
+        return int(self.scalar())
+
+    def __float__(self):
+        return float(self.scalar())
+
+    def __str__(self):
+        return str(self.scalar())
+
+    def __repr__(self):
+        return repr(self.scalar())
+
+    def __format__(self, spec):
+        return format(self.scalar(), spec)
+
+
+class DeviceText(DeviceValue):
+    """A string with one value per device, such as an id derived from sizes"""
+
+    __slots__ = ()
+
+    def __add__(self, other):
+        return DeviceText(np.char.add(self.values, _values(other)))
+
+    def __radd__(self, other):
+        return DeviceText(np.char.add(_values(other), self.values))
+
+
+def substitute(value, resolve):
+    """value with every DeviceValue in it replaced by resolve(device_value)"""
+    if isinstance(value, DeviceValue):
+        return resolve(value)
+    if isinstance(value, tuple):
+        return tuple(substitute(item, resolve) for item in value)
+    if isinstance(value, list):
+        return [substitute(item, resolve) for item in value]
+    return value
+
+
+class Slot:
+    """Placeholder for a DeviceValue in a fast_svg template"""
+
+    __slots__ = ('number',)
+
+    def __init__(self, number):
+        self.number = number
+
+    def __str__(self):
+        return f'\x00{self.number}\x00'
+
+    def __format__(self, spec):
+        return str(self)
+
+
+class Node:
+    """A recorded element factory call and the children added to it"""
+
+    __slots__ = ('factory', 'args', 'kwargs', 'elements')
+
+    def __init__(self, factory, args, kwargs):
+        self.factory = factory
+        self.args = args
+        self.kwargs = kwargs
+        self.elements = []
+
+    def add(self, element):
+        self.elements.append(element)
+        return element
+
+    def replay(self, dwg, resolve):
+        args = [substitute(arg, resolve) for arg in self.args]
+        kwargs = {key: substitute(value, resolve) for key, value in self.kwargs.items()}
+        element = getattr(dwg, self.factory)(*args, **kwargs)
+        for child in self.elements:
+            element.add(child.replay(dwg, resolve))
+        return element
+
+
+class RecordingDrawing:
+    """Drawing surface that records the screen instead of rendering it"""
+
+    def __init__(self, size):
+        self.size = size
+        self.defs = Node('defs', (), {})
+        self.elements = []
+
+    def add(self, element):
+        self.elements.append(element)
+        return element
+
+    def _record(factory):
+        def record(self, *args, **kwargs):
+            return Node(factory, args, kwargs)
+        record.__name__ = factory
+        return record
+
+    g = _record('g')
+    clipPath = _record('clipPath')
+    use = _record('use')
+    rect = _record('rect')
+    circle = _record('circle')
+    text = _record('text')
+    path = _record('path')
+    del _record
+
+    def replay(self, backend, stylesheet, resolve):
+        """A real drawing with each DeviceValue replaced by resolve(value)"""
+        dwg = drawing_class(backend)(
+            size=substitute(self.size, resolve),
+            stylesheet=StyleSheet() if stylesheet else None
+        )
+        for node in self.defs.elements:
+            dwg.defs.add(node.replay(dwg, resolve))
+        for node in self.elements:
+            dwg.add(node.replay(dwg, resolve))
+        return dwg
+
+    def template(self, stylesheet):
+        """(format string, per-slot value lists) producing every device's SVG
+
+        The recording is serialized once by the fast backend with numbered
+        slots for its DeviceValues, so a device's SVG is a single
+        str.format() call. None if a slot ended up inside the stylesheet.
+        """
+        slots = []
+
+        def slot(value):
+            slots.append(value)
+            return Slot(len(slots) - 1)
+
+        dwg = self.replay('fast', stylesheet, slot)
+        if dwg.stylesheet and '\x00' in dwg.stylesheet.css():
+            return None
+        svg = dwg.tostring().replace('{', '{{').replace('}', '}}')
+        return SLOT.sub(r'{\1}', svg), [value.values.tolist() for value in slots]
+
+
+def resized(wireframes, width, height):
+    """Copy of wireframes drawing at another screen size"""
+    copied = copy.copy(wireframes)
+    copied.screen_width, copied.screen_height = width, height
+    copied.layouts = {}
+    return copied
+
+
+def device_symbol_id(wireframes, count, key):
+    """Each device's symbol id for key, a DeviceText unless they all agree
+
+    Ids digest the symbol's sizes, so they are computed per device here
+    instead of tracing needing the sizes as plain numbers.
+    """
+    symbol_id = type(wireframes).symbol_id
+    ids = [
+        symbol_id(wireframes, substitute(key, lambda value: value.at(i)))
+        for i in range(count)
+    ]
+    if all(value == ids[0] for value in ids):
+        return ids[0]
+    return DeviceText(ids)
+
+
+def trace(wireframes, screen, sizes, params):
+    """Record screen once for a group of (width, height) sizes"""
+    widths, heights = zip(*sizes)
+    size = (DeviceValue(widths), DeviceValue(heights))
+    tracer = resized(wireframes, *size)
+    tracer.new_drawing = lambda: RecordingDrawing(size)
+    tracer.symbol_id = partial(device_symbol_id, tracer, len(sizes))
+    dwg = tracer.build(screen, **params)
+    # The culling proxy records into the drawing it wraps
+    return getattr(dwg, 'dwg', dwg)
+
+
+def render_sizes(wireframes, screen, sizes, **params):
+    """SVG strings of screen at each (width, height), in order
+
+    Keyword params are passed on to the screen builder like render().
+    """
+    sizes = [tuple(size) for size in sizes]
+    svgs = [None] * len(sizes)
+
+    def render_each(indexes):
+        for i in indexes:
+            svgs[i] = resized(wireframes, *sizes[i]).render(screen, **params)
+
+    if np is None:
+        render_each(range(len(sizes)))
+        return svgs
+
+    pending = [list(range(len(sizes)))]
+    while pending:
+        group = pending.pop()
+        if len(group) == 1:
+            # Tracing a single device costs more than rendering it
+            render_each(group)
+            continue
+        try:
+            recording = trace(wireframes, screen, [sizes[i] for i in group], params)
+        except Divergence as exc:
+            # Trace each set of devices that agree on the diverging value
+            _, keys = np.unique(exc.keys, return_inverse=True)
+            for key in range(keys.max() + 1):
+                pending.append([i for i, k in zip(group, keys) if k == key])
+            continue
+        except Exception:
+            # Not traceable; the scalar path raises any genuine error
+            render_each(group)
+            continue
+        template = None
+        if wireframes.backend == 'fast':
+            template = recording.template(wireframes.stylesheet)
+        if template is not None:
+            text, columns = template
+            for i, row in zip(group, zip(*columns) if columns else [()] * len(group)):
+                svgs[i] = text.format(*row)
+            continue
+        for index, i in enumerate(group):
+            svgs[i] = recording.replay(
+                wireframes.backend, wireframes.stylesheet, lambda value: value.at(index)
+            ).tostring()
+    return svgs
+
+
+def render_devices(wireframes, screen, devices=None, **params):
+    """Dict of device name to SVG for screen, for DEVICES names or all of them"""
+    names = list(devices or DEVICES)
+    return dict(zip(names, render_sizes(wireframes, screen, [DEVICES[name] for name in names], **params)))
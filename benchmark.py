@@ -0,0 +1,322 @@
+"""Benchmark building, serializing and embedding every wireframe screen.
+
+    python benchmark.py [--repeat N] [--warmup N] [--backend NAME ...]
+        [--screens create_welcome_screen ...] [--symbols] [--stylesheet]
+        [--items N] [--scroll PX]
+        [--save baseline.json] [--compare baseline.json [--threshold 0.2]]
+    python benchmark.py --imports
+    python benchmark.py --lint-scaling
+
+Times are the median of --repeat runs after --warmup untimed runs. --save
+writes a JSON baseline; --compare reports screens that got slower or larger
+than a saved baseline and exits non-zero if any did.
+
+--imports instead times cold imports of the modules in IMPORT_BUDGETS, each
+in a fresh interpreter, and exits non-zero if one is over its budget or
+loads a module that should only load on demand.
+
+--lint-scaling runs lint.overlapping_pairs on growing stacks of full-width
+rows, which overlap on x but never on y, entering the sweep top to bottom
+and bottom to top. It exits non-zero if the sweep reads more than
+LINT_EXAMINED stored extents per row, which does not depend on timing, or
+if the fastest of LINT_RUNS runs grows more than LINT_MARGIN times faster
+than n log n from the fewest rows to the most.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+from hit_test import ElementInfo
+from lint import overlapping_pairs
+from wireframes import BACKENDS, LIST_SCREENS, SCREENS, UserAppWireframes, count_elements
+
+TIMED_PHASES = ('build_ms', 'serialize_ms', 'embed_ms')
+
+# Cold import budget in ms of each module, and the modules it must leave
+# unloaded until something is rendered
+IMPORT_BUDGETS = {
+    'screen_registry': (10, ('wireframes', 'svgwrite', 'numpy', 'streamlit')),
+    'wireframes': (60, ('svgwrite', 'numpy', 'streamlit')),
+}
+IMPORT_RUNS = 5
+
+# Row counts for --lint-scaling; from the fewest to the most, n log n grows
+# 22 times and n^2 256 times
+LINT_ROWS = (1000, 2000, 4000, 8000, 16000)
+LINT_EXAMINED = 2
+LINT_RUNS = 5
+LINT_MARGIN = 2
+
+
+def markdown_embedder():
+    """Return a function marshalling SVG the way st.markdown ships it, if available"""
+    try:
+        from streamlit.proto.Markdown_pb2 import Markdown
+    except ImportError:
+        return None
+
+    def embed(svg):
+        message = Markdown()
+        message.body = svg
+        message.allow_html = True
+        return message.SerializeToString()
+
+    return embed
+
+
+def measure(fn, repeat, warmup):
+    """Median milliseconds of fn() over repeat runs, and its last result"""
+    for _ in range(warmup):
+        result = fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def benchmark_screen(wireframes, screen, repeat, warmup, embed=None, params=None):
+    """Time each phase of one screen and record its size"""
+    def build():
+        return getattr(wireframes, screen)(**(params or {}))
+
+    build_ms, dwg = measure(build, repeat, warmup)
+    serialize_ms, svg = measure(dwg.tostring, repeat, warmup)
+    result = {
+        'build_ms': build_ms,
+        'serialize_ms': serialize_ms,
+        'embed_ms': None,
+        'elements': count_elements(dwg),
+        'bytes': len(svg.encode('utf-8'))
+    }
+    if embed is not None:
+        result['embed_ms'], _ = measure(lambda: embed(svg), repeat, warmup)
+    return result
+
+
+def measure_import(module, runs=IMPORT_RUNS):
+    """Fastest cold import of module over runs fresh interpreters, in ms,
+    and the names of every module it loaded"""
+    code = f'import sys, {module}; print(" ".join(sys.modules))'
+    best = None
+    for _ in range(runs):
+        # From the repository, so its modules import wherever this runs from
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', code],
+            capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+        )
+        if result.returncode:
+            raise RuntimeError(f'importing {module} failed: {result.stderr.strip().splitlines()[-1]}')
+        # importtime lines read "import time: self | cumulative | name"
+        ms = None
+        for line in result.stderr.splitlines():
+            fields = line.split('|')
+            if len(fields) == 3 and fields[2].strip() == module:
+                ms = int(fields[1]) / 1000
+        if ms is None:
+            raise RuntimeError(f'-X importtime reported no time for {module}')
+        best = ms if best is None else min(best, ms)
+    return best, set(result.stdout.split())
+
+
+def check_imports():
+    """Print each budgeted module's import time; return the budget failures"""
+    failures = []
+    print(f"{'module':34}{'import ms':>10}{'budget':>10}")
+    for module, (budget, lazy) in IMPORT_BUDGETS.items():
+        try:
+            ms, loaded = measure_import(module)
+        except RuntimeError as exc:
+            failures.append(str(exc))
+            continue
+        print(f'{module:34}{ms:10.3f}{budget:10.3f}')
+        if ms > budget:
+            failures.append(f'{module} imports in {ms:.1f} ms, over its {budget} ms budget')
+        failures.extend(
+            f'{module} loads {name} at import time'
+            for name in lazy if name in loaded
+        )
+    return failures
+
+
+def check_lint_scaling(runs=LINT_RUNS):
+    """Print overlapping_pairs work on stacked rows; return the scaling failures"""
+    failures = []
+    print(f"{'order':>10}{'rows':>10}{'examined':>10}{'sweep ms':>10}")
+    for order in ('down', 'up'):
+        times = []
+        for count in LINT_ROWS:
+            rows = range(count) if order == 'down' else range(count - 1, -1, -1)
+            infos = [
+                ElementInfo('row', 'rect', (0, 60 * i, 360, 60 * i + 50), None, None, i)
+                for i in rows
+            ]
+            stats = {}
+            pairs = list(overlapping_pairs(infos, stats))
+            # Fastest run: slower ones only measure other load on the machine
+            best = min(
+                measure(lambda: list(overlapping_pairs(infos)), 1, 0)[0]
+                for _ in range(runs)
+            )
+            times.append(best)
+            print(f"{order:>10}{count:10d}{stats['examined']:10d}{best:10.3f}")
+            if pairs:
+                failures.append(f'{len(pairs)} overlaps found among {count} disjoint rows')
+            if stats['examined'] > LINT_EXAMINED * count:
+                failures.append(
+                    f"sweeping {count} rows {order} read {stats['examined']} extents, "
+                    f'over {LINT_EXAMINED} per row'
+                )
+        first, last = LINT_ROWS[0], LINT_ROWS[-1]
+        allowed = LINT_MARGIN * (last * math.log2(last)) / (first * math.log2(first))
+        if times[-1] > times[0] * allowed:
+            failures.append(
+                f'sweeping {last} rows {order} took {times[-1] / times[0]:.0f} times as long '
+                f'as {first}, over {allowed:.0f}'
+            )
+    return failures
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(args):
+    embed = markdown_embedder()
+    list_params = {}
+    if args.items is not None:
+        list_params['item_count'] = args.items
+    if args.scroll:
+        list_params['scroll_offset'] = args.scroll
+    results = {}
+    for backend in args.backend:
+        wireframes = UserAppWireframes(
+            backend=backend, symbols=args.symbols, stylesheet=args.stylesheet
+        )
+        results[backend] = {
+            screen: benchmark_screen(
+                wireframes, screen, args.repeat, args.warmup, embed,
+                list_params if screen in LIST_SCREENS else None
+            )
+            for screen in args.screens
+        }
+    return {
+        'meta': {
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'repeat': args.repeat,
+            'warmup': args.warmup,
+            'symbols': args.symbols,
+            'stylesheet': args.stylesheet,
+            'items': args.items,
+            'scroll': args.scroll
+        },
+        'results': results
+    }
+
+
+def format_ms(value):
+    return f'{value:10.3f}' if value is not None else f"{'-':>10}"
+
+
+def print_report(report):
+    header = f"{'screen':34}{'build ms':>10}{'serial ms':>10}{'embed ms':>10}{'elements':>10}{'bytes':>10}"
+    for backend, screens in report['results'].items():
+        print(f'\n[{backend}]')
+        print(header)
+        for screen, result in screens.items():
+            print(
+                f'{screen:34}'
+                + ''.join(format_ms(result[phase]) for phase in TIMED_PHASES)
+                + f"{result['elements']:10d}{result['bytes']:10d}"
+            )
+        total = sum(r['build_ms'] + r['serialize_ms'] for r in screens.values())
+        print(f"{'total build + serialize':34}{total:10.3f}")
+
+
+def compare(report, baseline, threshold):
+    """List (backend, screen, metric, old, new) that regressed past threshold"""
+    regressions = []
+    for backend, screens in report['results'].items():
+        for screen, result in screens.items():
+            old = baseline['results'].get(backend, {}).get(screen)
+            if old is None:
+                continue
+            for metric in TIMED_PHASES + ('elements', 'bytes'):
+                if result[metric] is None or old.get(metric) is None:
+                    continue
+                # Times are noisy, so they regress only past the threshold
+                limit = old[metric] * (1 + threshold) if metric in TIMED_PHASES else old[metric]
+                if result[metric] > limit:
+                    regressions.append((backend, screen, metric, old[metric], result[metric]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--backend', action='append', choices=sorted(BACKENDS))
+    parser.add_argument('--screens', nargs='+', choices=SCREENS, default=SCREENS)
+    parser.add_argument('--symbols', action='store_true')
+    parser.add_argument('--stylesheet', action='store_true')
+    parser.add_argument('--items', type=int, help='item count for every list screen')
+    parser.add_argument('--scroll', type=int, default=0, help='scroll offset for list screens')
+    parser.add_argument('--save', metavar='FILE', help='write results as a JSON baseline')
+    parser.add_argument('--compare', metavar='FILE', help='compare against a JSON baseline')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='allowed relative slowdown before a time counts as a regression')
+    parser.add_argument('--imports', action='store_true',
+                        help='check cold import times against IMPORT_BUDGETS instead')
+
+    parser.add_argument('--lint-scaling', action='store_true',
+                        help='check that the lint sweep scales as O(n log n) instead')
+    args = parser.parse_args(argv)
+
+    if args.imports or args.lint_scaling:
+        failures = check_imports() if args.imports else check_lint_scaling()
+        for failure in failures:
+            print(f'  {failure}')
+        return 1 if failures else 0
+    args.backend = args.backend or sorted(BACKENDS)
+
+    report = run_suite(args)
+    print_report(report)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f'\nSaved baseline to {args.save}')
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        revision = baseline['meta'].get('revision') or args.compare
+        if not regressions:
+            print(f'\nNo regressions against {revision}')
+            return 0
+        print(f'\nRegressions against {revision}:')
+        for backend, screen, metric, old, new in regressions:
+            print(f'  {backend:9}{screen:34}{metric:14}{old:10.3f} -> {new:10.3f}')
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
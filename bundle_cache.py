@@ -0,0 +1,282 @@
+"""Persistent store of rendered screens in one memory-mapped bundle file.
+
+A bundle is a header, the SVG bodies back to back and a JSON index:
+
+    magic (8 bytes) | index offset (u64) | index length (u64)
+    body | body | ...
+    {"entries": {digest: [offset, length, last used], ...}}
+
+Entries are keyed by a digest of the render cache key and a hash of the
+source of every module that shapes the output, so editing any of them
+misses everything rendered before. Reads slice the memory-mapped file, so
+opening a bundle costs one read of its index however large it is.
+
+Writes are batched: put() only collects entries, and a background timer
+flush_interval seconds later calls flush(). That merges them with the
+bundle currently on disk (which another process may have replaced), drops
+the least recently used entries past max_bytes, writes a temporary file
+and renames it over the bundle, all without holding the lock readers take,
+so no render request waits for a bundle to be copied. Readers always see
+a whole bundle, old or new, and several processes can share one directory;
+when two flush at once one's new entries are lost, which only costs a
+render.
+
+Screens registered at runtime with screen_specs.register_screen are keyed
+by name only, so give a changed spec a new name while a bundle is in use.
+"""
+import atexit
+import hashlib
+import importlib.util
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+
+MAGIC = b'LOFIBND1'
+HEADER = struct.Struct('<8sQQ')
+
+# Modules whose source determines rendered output
+SOURCE_MODULES = (
+    'wireframes', 'screen_specs', 'layout', 'text_metrics', 'culling', 'stylesheet',
+    'fast_svg', 'columnar_svg', 'svgwrite_backend',
+)
+
+
+def open_bundle(path):
+    """(file, map, index) of the bundle at path, or None if there is none"""
+    try:
+        f = open(path, 'rb')
+    except FileNotFoundError:
+        return None
+    size = os.fstat(f.fileno()).st_size
+    if size < HEADER.size:
+        f.close()
+        return None
+    bundle = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, index_offset, index_length = HEADER.unpack_from(bundle)
+    if magic != MAGIC or index_offset + index_length > size:
+        # Not a bundle we can read; the next flush replaces it
+        bundle.close()
+        f.close()
+        return None
+    index = json.loads(bundle[index_offset:index_offset + index_length])
+    return f, bundle, index['entries']
+
+
+def source_hash(modules=SOURCE_MODULES):
+    """Hash of the source files of modules, found without importing them"""
+    digest = hashlib.sha256()
+    for name in modules:
+        spec = importlib.util.find_spec(name)
+        with open(spec.origin, 'rb') as f:
+            digest.update(name.encode('utf-8') + b'\0' + f.read())
+    return digest.hexdigest()
+
+
+class BundleCache:
+    """Rendered SVG strings by render cache key, persisted in path"""
+
+    def __init__(self, path, max_bytes=64 * 1024 * 1024, flush_interval=1.0, source=None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+        self.source = source_hash() if source is None else source
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Guards the mapped bundle and the pending entries; never held
+        # while a bundle is written
+        self._lock = threading.RLock()
+        # Serializes flushes
+        self._flush_lock = threading.Lock()
+        self._timer = None
+        self._file = None
+        self._map = None
+        self._identity = None
+        # digest -> [offset, length, last used] in the mapped bundle
+        self._index = {}
+        # digest -> encoded SVG not yet flushed
+        self._pending = {}
+        # digest -> last used, for puts and reads not yet flushed
+        self._used = {}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._load()
+        atexit.register(self.close)
+
+    def digest(self, key):
+        return hashlib.sha256(f'{self.source}\0{key!r}'.encode('utf-8')).hexdigest()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._index.keys() | self._pending.keys())
+
+    def get(self, key):
+        """Return the stored SVG for key, or None"""
+        digest = self.digest(key)
+        with self._lock:
+            data = self._pending.get(digest)
+            if data is not None:
+                self._used[digest] = time.time()
+                self.hits += 1
+                return data.decode('utf-8')
+            if digest in self._index:
+                return self._read(digest)
+        # Another process may have written it since we mapped ours
+        self._load()
+        with self._lock:
+            if digest in self._index:
+                return self._read(digest)
+            self.misses += 1
+            return None
+
+    def _read(self, digest):
+        offset, length, _ = self._index[digest]
+        self._used[digest] = time.time()
+        self.hits += 1
+        with memoryview(self._map) as view:
+            return str(view[offset:offset + length], 'utf-8')
+
+    def put(self, key, svg):
+        """Store svg under key; a background flush writes it out shortly"""
+        digest = self.digest(key)
+        with self._lock:
+            self._pending[digest] = svg.encode('utf-8')
+            self._used[digest] = time.time()
+            self._schedule()
+
+    def _schedule(self):
+        if self._timer is None:
+            self._timer = threading.Timer(self.flush_interval, self._flush_later)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush_later(self):
+        with self._lock:
+            self._timer = None
+        self.flush()
+
+    def flush(self):
+        """Merge pending entries into the bundle on disk and replace it atomically"""
+        with self._flush_lock:
+            with self._lock:
+                pending = dict(self._pending)
+                used = dict(self._used)
+                self._used.clear()
+            if not pending and not used:
+                return
+            # A map of our own: readers may remap theirs meanwhile
+            bundle = open_bundle(self.path)
+            try:
+                kept = self._merge(pending, used, bundle[2] if bundle else {})
+                self._write(kept, bundle[1] if bundle else None)
+            finally:
+                if bundle is not None:
+                    bundle[1].close()
+                    bundle[0].close()
+            self._load()
+            with self._lock:
+                for digest, data in pending.items():
+                    if self._pending.get(digest) is data:
+                        del self._pending[digest]
+
+    def _merge(self, pending, used, index):
+        """(digest, last used, body) to keep, most recently used first;
+        a body is bytes or the (offset, length) of one in the bundle on disk"""
+        now = time.time()
+        entries = {
+            digest: (used.get(digest, last_used), (offset, length))
+            for digest, (offset, length, last_used) in index.items()
+        }
+        for digest, data in pending.items():
+            entries[digest] = (used.get(digest, now), data)
+        kept, total = [], 0
+        for digest, (last_used, body) in sorted(entries.items(), key=lambda item: -item[1][0]):
+            size = len(body) if isinstance(body, bytes) else body[1]
+            if total + size > self.max_bytes:
+                self.evictions += 1
+                continue
+            kept.append((digest, last_used, body))
+            total += size
+        return kept
+
+    def _write(self, entries, bundle):
+        temporary = f'{self.path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        index = {}
+        with open(temporary, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, 0, 0))
+            for digest, used, body in entries:
+                offset = f.tell()
+                if isinstance(body, bytes):
+                    f.write(body)
+                else:
+                    with memoryview(bundle) as view:
+                        f.write(view[body[0]:body[0] + body[1]])
+                index[digest] = [offset, f.tell() - offset, used]
+            index_offset = f.tell()
+            data = json.dumps({'entries': index}, separators=(',', ':')).encode('utf-8')
+            f.write(data)
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, index_offset, len(data)))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, self.path)
+
+    def _load(self):
+        """Map the bundle at path if it is not the one already mapped
+
+        The new bundle is opened and its index read before taking the lock,
+        so readers only wait for the swap.
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if identity == self._identity:
+                return
+        bundle = open_bundle(self.path)
+        with self._lock:
+            if identity == self._identity:
+                stale, bundle = bundle, None
+            else:
+                stale = (self._file, self._map) if self._map is not None else None
+                self._identity = identity
+                self._file, self._map, self._index = bundle or (None, None, {})
+        if stale is not None:
+            stale[1].close()
+            stale[0].close()
+
+    def _close(self):
+        self._index = {}
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+        self._map = self._file = None
+
+    def close(self):
+        """Flush pending entries and unmap the bundle"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        self.flush()
+        with self._lock:
+            self._close()
+            self._identity = None
+
+    def stats(self):
+        """Return a snapshot of the store counters"""
+        with self._lock:
+            return {
+                'entries': len(self),
+                'bytes': (self._identity[2] if self._identity else 0)
+                         + sum(len(data) for data in self._pending.values()),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
@@ -0,0 +1,333 @@
+"""Column-oriented SVG backend for screens with very many elements.
+
+Elements are rows in parallel ``array`` columns rather than objects: kind,
+x, y, w, h, rx, ry, a style index and a text index. Everything that is not
+geometry (fill, stroke, inline style, class, href, path data) is interned
+in the style and string tables, so a row costs about 65 bytes whatever its
+attributes: roughly half of fast_svg's formatted strings and an eighth of
+svgwrite's element objects. Each distinct (kind, style, geometry present) combination gets
+one format template, and serialization fills templates straight from the
+columns. Output matches fast_svg byte for byte; building and serializing
+are slower than fast_svg, so prefer it unless memory is the constraint.
+
+Rows can be moved or scaled in bulk with translate() and scale(), using
+NumPy views of the columns when NumPy is installed. By default they apply
+to the drawn rows only, not to <defs> content, which is positioned by the
+<use> rows instancing it. Raw rows hold finished markup and are not moved.
+"""
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from culling import NUMBER
+from fast_svg import SVG_HEADER, escape_attrib, escape_text, format_element, svg_name
+
+RECT, CIRCLE, TEXT, PATH, USE, GROUP, RAW = range(7)
+TAGS = ('rect', 'circle', 'text', 'path', 'use', None, None)
+
+# Geometry columns, the SVG attribute each holds per kind, and the bit
+# marking a present value that was an int rather than a float
+COLUMNS = ('x', 'y', 'w', 'h', 'rx', 'ry')
+ATTRIBUTES = {
+    RECT: ('x', 'y', 'width', 'height', 'rx', 'ry'),
+    CIRCLE: ('cx', 'cy', 'r', None, None, None),
+    TEXT: ('x', 'y', None, None, None, None),
+    PATH: (None, None, None, None, None, None),
+    USE: ('x', 'y', None, None, None, None),
+}
+PRESENT, INTEGER = 1, 64
+
+
+def is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class Group:
+    """Container row; children keep the handles they were added as"""
+
+    def __init__(self, drawing, tag, **extra):
+        self.drawing = drawing
+        self.tag = tag
+        self.attribs = {svg_name(key): value for key, value in extra.items()}
+        self.elements = []
+        self.row = drawing.append_row(GROUP, text=drawing.intern(self))
+
+    def add(self, element):
+        self.elements.append(element)
+        return element
+
+
+class Drawing:
+    """Drawing storing its elements in columns of typed arrays"""
+
+    def __init__(self, size=('100%', '100%'), stylesheet=None, **extra):
+        self.width, self.height = size
+        self.stylesheet = stylesheet
+        self.kind = array('B')
+        self.flags = array('H')
+        self.style_index = array('I')
+        self.text_index = array('i')
+        self.columns = {name: array('d') for name in COLUMNS}
+        self.order = array('i')
+        # Interned non-geometry attribute sets and strings (texts, path data,
+        # raw markup, groups), by index
+        self.styles = []
+        self.strings = []
+        self._style_ids = {}
+        self._string_ids = {}
+        self._templates = {}
+        self.defs = Group(self, 'defs')
+
+    def __len__(self):
+        return len(self.kind)
+
+    def intern(self, value):
+        """Index of value in the string table"""
+        if isinstance(value, Group):
+            self.strings.append(value)
+            return len(self.strings) - 1
+        index = self._string_ids.get(value)
+        if index is None:
+            index = self._string_ids[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+    def intern_style(self, attribs):
+        key = tuple(sorted(attribs.items()))
+        index = self._style_ids.get(key)
+        if index is None:
+            index = self._style_ids[key] = len(self.styles)
+            self.styles.append(key)
+        return index
+
+    def append_row(self, kind, geometry=(), style=0, text=-1):
+        """Add a row and return its index; geometry is up to six numbers or None"""
+        flags = 0
+        values = list(geometry) + [None] * (len(COLUMNS) - len(geometry))
+        for bit, (name, value) in enumerate(zip(COLUMNS, values)):
+            column = self.columns[name]
+            if value is None:
+                column.append(0.0)
+                continue
+            column.append(value)
+            flags |= PRESENT << bit
+            if isinstance(value, int):
+                flags |= INTEGER << bit
+        self.kind.append(kind)
+        self.flags.append(flags)
+        self.style_index.append(style)
+        self.text_index.append(text)
+        return len(self.kind) - 1
+
+    def element(self, kind, geometry, extra, text=None):
+        """Row for an element, or a raw markup row if its geometry is not numeric"""
+        attribs = {svg_name(key): value for key, value in extra.items()}
+        # Numeric rx/ry live in columns like the rest of the geometry
+        geometry = list(geometry) + [None] * (4 - len(geometry))
+        for name in ('rx', 'ry'):
+            value = attribs.get(name)
+            if kind == RECT and is_number(value):
+                geometry.append(attribs.pop(name))
+            else:
+                geometry.append(None)
+        if not all(value is None or is_number(value) for value in geometry):
+            return self.raw(kind, geometry, attribs, text)
+        if self.stylesheet is not None:
+            self.stylesheet.classify(attribs)
+        return self.append_row(
+            kind, geometry, self.intern_style(attribs),
+            -1 if text is None else self.intern(str(text))
+        )
+
+    def raw(self, kind, geometry, attribs, text):
+        """Row holding fully formatted markup for an element the columns cannot hold"""
+        for name, value in zip(ATTRIBUTES[kind], geometry):
+            if name is not None and value is not None:
+                attribs[name] = value
+        if self.stylesheet is not None:
+            self.stylesheet.classify(attribs)
+        markup = format_element(TAGS[kind], attribs, text)
+        return self.append_row(RAW, text=self.intern(markup))
+
+    def add(self, element):
+        self.order.append(self.row_of(element))
+        return element
+
+    def row_of(self, element):
+        return element.row if isinstance(element, Group) else element
+
+    @property
+    def elements(self):
+        """Top-level handles, in paint order"""
+        return [
+            self.strings[self.text_index[row]] if self.kind[row] == GROUP else row
+            for row in self.order
+        ]
+
+    def g(self, **extra):
+        return Group(self, 'g', **extra)
+
+    def clipPath(self, **extra):
+        return Group(self, 'clipPath', **extra)
+
+    def use(self, href, insert=None, **extra):
+        x, y = insert if insert is not None else (None, None)
+        return self.element(USE, (x, y), {'xlink:href': href, **extra})
+
+    def rect(self, insert=(0, 0), size=(1, 1), **extra):
+        return self.element(RECT, (*insert, *size), extra)
+
+    def circle(self, center=(0, 0), r=1, **extra):
+        return self.element(CIRCLE, (*center, r), extra)
+
+    def text(self, text, insert=None, **extra):
+        x, y = insert if insert is not None else (None, None)
+        return self.element(TEXT, (x, y), extra, text=text)
+
+    def path(self, d=None, **extra):
+        return self.element(PATH, (), {'d': d, **extra})
+
+    # Bulk transforms
+    def rows(self, kinds=None):
+        """Indexes of the drawn rows: top-level rows and their group
+        descendants, without <defs>; only those whose kind is in kinds if given"""
+        found = []
+        pending = list(reversed(self.order))
+        while pending:
+            row = pending.pop()
+            if kinds is None or self.kind[row] in kinds:
+                found.append(row)
+            if self.kind[row] == GROUP:
+                group = self.strings[self.text_index[row]]
+                pending.extend(self.row_of(child) for child in reversed(group.elements))
+        return found
+
+    def translate(self, dx, dy, rows=None):
+        """Move rows (default the drawn rows) by (dx, dy), path data included;
+        raw rows are left as they are"""
+        rows = self.rows() if rows is None else rows
+        self._apply('x', rows, lambda values: values + dx, is_number(dx) and isinstance(dx, int))
+        self._apply('y', rows, lambda values: values + dy, is_number(dy) and isinstance(dy, int))
+        for row in rows:
+            if self.kind[row] == PATH:
+                self._transform_path(row, lambda x, y: (x + dx, y + dy))
+
+    def scale(self, factor, rows=None):
+        """Scale rows' (default the drawn rows) geometry about the origin;
+        text size and raw rows are left as they are"""
+        rows = self.rows() if rows is None else rows
+        keeps_int = isinstance(factor, int)
+        for name in COLUMNS:
+            self._apply(name, rows, lambda values: values * factor, keeps_int)
+        for row in rows:
+            if self.kind[row] == PATH:
+                self._transform_path(row, lambda x, y: (x * factor, y * factor))
+
+    def _apply(self, name, rows, operation, keeps_int):
+        column = self.columns[name]
+        bit = COLUMNS.index(name)
+        if np is not None:
+            view = np.frombuffer(column, dtype=np.float64)
+            index = np.asarray(rows, dtype=np.intp)
+            view[index] = operation(view[index])
+        else:
+            for row in rows:
+                column[row] = operation(column[row])
+        if not keeps_int:
+            for row in rows:
+                self.flags[row] &= ~(INTEGER << bit)
+
+    def _transform_path(self, row, point):
+        style = dict(self.styles[self.style_index[row]])
+        d = style.get('d')
+        if not d:
+            return
+        numbers = iter(NUMBER.finditer(d))
+        parts, end = [], 0
+        for x_match in numbers:
+            y_match = next(numbers, None)
+            if y_match is None:
+                break
+            x, y = point(float(x_match.group()), float(y_match.group()))
+            parts.append(d[end:x_match.start()])
+            parts.append(f'{x:g}')
+            parts.append(d[x_match.end():y_match.start()])
+            parts.append(f'{y:g}')
+            end = y_match.end()
+        parts.append(d[end:])
+        style['d'] = ''.join(parts)
+        self.style_index[row] = self.intern_style(style)
+
+    # Serialization
+    def template(self, kind, style, flags):
+        """(format string, geometry bits it takes) for rows of one kind, style
+        and geometry presence; texts take their content last"""
+        key = (kind, style, flags & 0x3f)
+        entry = self._templates.get(key)
+        if entry is None:
+            parts = []
+            for name, value in self.styles[style]:
+                if value is None:
+                    continue
+                value = str(value)
+                if value:
+                    parts.append((name, escape_attrib(value).replace('{', '{{').replace('}', '}}')))
+            bits = tuple(
+                bit for bit, name in enumerate(ATTRIBUTES[kind])
+                if name is not None and flags & (PRESENT << bit)
+            )
+            for slot, bit in enumerate(bits):
+                parts.append((ATTRIBUTES[kind][bit], f'{{{slot}}}'))
+            attributes = ''.join(f' {name}="{value}"' for name, value in sorted(parts))
+            tag = TAGS[kind]
+            if kind == TEXT:
+                template = f'<{tag}{attributes}>{{{len(bits)}}}</{tag}>'
+            else:
+                template = f'<{tag}{attributes} />'
+            entry = self._templates[key] = (template, bits)
+        return entry
+
+    def format_rows(self, rows):
+        """Markup of each row, filled straight from the columns"""
+        kinds, flags, styles, texts = self.kind, self.flags, self.style_index, self.text_index
+        columns = [self.columns[name] for name in COLUMNS]
+        for row in rows:
+            kind = kinds[row]
+            if kind == RAW:
+                yield self.strings[texts[row]]
+                continue
+            if kind == GROUP:
+                yield self.format_group(self.strings[texts[row]])
+                continue
+            row_flags = flags[row]
+            template, bits = self.template(kind, styles[row], row_flags)
+            values = [
+                int(columns[bit][row]) if row_flags & (INTEGER << bit) else columns[bit][row]
+                for bit in bits
+            ]
+            if kind == TEXT:
+                values.append(escape_text(self.strings[texts[row]]))
+            yield template.format(*values)
+
+    def format_group(self, group, prefix=()):
+        children = list(prefix)
+        children.extend(self.format_rows([self.row_of(child) for child in group.elements]))
+        attributes = ''.join(
+            f' {name}="{escape_attrib(value)}"'
+            for name, value in sorted(group.attribs.items())
+            if value is not None and str(value)
+        )
+        if not children:
+            return f'<{group.tag}{attributes} />'
+        return f'<{group.tag}{attributes}>{"".join(children)}</{group.tag}>'
+
+    def tostring(self):
+        header = SVG_HEADER.format(width=self.width, height=self.height)
+        prefix = ()
+        if self.stylesheet:
+            prefix = (f'<style>{escape_text(self.stylesheet.css())}</style>',)
+        body = ''.join(self.format_rows(self.order))
+        return header + self.format_group(self.defs, prefix) + body + '</svg>'
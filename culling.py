@@ -0,0 +1,196 @@
+"""Viewport culling for wireframe drawings.
+
+BoundsDrawing wraps either drawing backend and records the bounding box of
+every element it creates; the box of a group drawn through a clip path
+of the drawing is cut to the clip's box. CullingDrawing builds on it:
+elements added entirely outside the phone frame are dropped and reported
+in ``culled``; elements straddling its edge are wrapped in a group clipped
+to the frame and counted in ``clipped``.
+"""
+import re
+
+from text_metrics import parse_font, text_width
+
+NUMBER = re.compile(r'-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?')
+
+# Vertical extent of a line of text, as fractions of the font size
+TEXT_ASCENT = 0.8
+TEXT_DESCENT = 0.2
+
+
+def text_bbox(text, x, y, style='', anchor='start'):
+    """Box of a single line of text drawn at baseline (x, y)"""
+    family, font_size, weight = parse_font(style)
+    width = text_width(text, family, font_size, weight)
+    if anchor == 'middle':
+        x -= width / 2
+    elif anchor == 'end':
+        x -= width
+    return (x, y - font_size * TEXT_ASCENT, x + width, y + font_size * TEXT_DESCENT)
+
+
+def path_bbox(d):
+    """Box around every coordinate pair of an absolute path"""
+    values = [float(v) for v in NUMBER.findall(d or '')]
+    xs, ys = values[0::2], values[1::2]
+    if not xs or not ys:
+        return None
+    return (min(xs), min(ys), max(xs), max(ys))
+
+
+def union(boxes):
+    boxes = [box for box in boxes if box is not None]
+    if not boxes:
+        return None
+    return (
+        min(box[0] for box in boxes), min(box[1] for box in boxes),
+        max(box[2] for box in boxes), max(box[3] for box in boxes)
+    )
+
+
+def intersection(box, other):
+    """Overlap of two boxes, or None if they do not overlap"""
+    if box is None or other is None:
+        return None
+    left, top = max(box[0], other[0]), max(box[1], other[1])
+    right, bottom = min(box[2], other[2]), min(box[3], other[3])
+    if left >= right or top >= bottom:
+        return None
+    return (left, top, right, bottom)
+
+
+def clipped_group(dwg, box):
+    """Group of dwg clipped to box, defining the clip path on first use"""
+    left, top, right, bottom = box
+    # Shared by every inline SVG on the page, so name it by geometry
+    clip_id = f'clip-{left}-{top}-{right}-{bottom}'.replace('.', '_')
+    if not hasattr(dwg, 'clip_ids'):
+        dwg.clip_ids = set()
+    if clip_id not in dwg.clip_ids:
+        dwg.clip_ids.add(clip_id)
+        clip = dwg.clipPath(id=clip_id)
+        clip.add(dwg.rect((left, top), (right - left, bottom - top)))
+        dwg.defs.add(clip)
+    return dwg.g(clip_path=f'url(#{clip_id})')
+
+
+class BoundsDrawing:
+    """Drawing proxy recording the bounding box of every element it creates"""
+
+    def __init__(self, dwg):
+        self.dwg = dwg
+        # id(element) -> (element, bbox); the element keeps the id valid
+        self._boxes = {}
+        self._symbols = {}
+        # url(#id) -> clip path, and id(group) -> (group, clip path)
+        self._clip_paths = {}
+        self._clips = {}
+
+    def __getattr__(self, name):
+        return getattr(self.dwg, name)
+
+    def _track(self, element, bbox):
+        self._boxes[id(element)] = (element, bbox)
+        return element
+
+    def bbox(self, element):
+        """Bounding box recorded for element, or None if unknown"""
+        entry = self._boxes.get(id(element))
+        if entry is not None:
+            return entry[1]
+        # Groups are measured from their children when asked
+        bbox = union(self.bbox(child) for child in getattr(element, 'elements', ()))
+        clip = self.clip_box(element)
+        return bbox if clip is None else intersection(bbox, clip)
+
+    def clip_box(self, group):
+        """Box of the clip path group is drawn through, or None"""
+        entry = self._clips.get(id(group))
+        if entry is None:
+            return None
+        return union(self.bbox(child) for child in entry[1].elements)
+
+    def rect(self, insert=(0, 0), size=(1, 1), **extra):
+        (x, y), (width, height) = insert, size
+        return self._track(self.dwg.rect(insert, size, **extra), (x, y, x + width, y + height))
+
+    def circle(self, center=(0, 0), r=1, **extra):
+        cx, cy = center
+        return self._track(self.dwg.circle(center, r, **extra), (cx - r, cy - r, cx + r, cy + r))
+
+    def text(self, text, insert=None, **extra):
+        element = self.dwg.text(text, insert=insert, **extra)
+        if insert is None:
+            return element
+        bbox = text_bbox(
+            str(text), insert[0], insert[1],
+            extra.get('style', ''), extra.get('text_anchor', 'start')
+        )
+        return self._track(element, bbox)
+
+    def path(self, d=None, **extra):
+        return self._track(self.dwg.path(d=d, **extra), path_bbox(d))
+
+    def g(self, **extra):
+        group = self.dwg.g(**extra)
+        if 'id' in extra:
+            self._symbols['#' + extra['id']] = group
+        clip = self._clip_paths.get(extra.get('clip_path'))
+        if clip is not None:
+            self._clips[id(group)] = (group, clip)
+        return group
+
+    def clipPath(self, **extra):
+        clip = self.dwg.clipPath(**extra)
+        if 'id' in extra:
+            self._clip_paths[f"url(#{extra['id']})"] = clip
+        return clip
+
+    def use(self, href, insert=None, **extra):
+        element = self.dwg.use(href, insert=insert, **extra)
+        symbol = self._symbols.get(href)
+        if symbol is None:
+            return element
+        bbox = self.bbox(symbol)
+        if bbox is not None and insert is not None:
+            x, y = insert
+            bbox = (bbox[0] + x, bbox[1] + y, bbox[2] + x, bbox[3] + y)
+        return self._track(element, bbox)
+
+
+class CullingDrawing(BoundsDrawing):
+    """Drawing proxy that culls and clips elements against the frame"""
+
+    def __init__(self, dwg, frame):
+        super().__init__(dwg)
+        self.frame = frame
+        self.culled = []
+        self.clipped = 0
+        self._clip_id = None
+
+    def clip_id(self):
+        """Id of the frame clip path, defined on first use"""
+        if self._clip_id is None:
+            width, height = self.frame
+            # Shared by every inline SVG on the page, so name it by geometry
+            self._clip_id = f'frame-{width}x{height}'.replace('.', '_')
+            clip = self.dwg.clipPath(id=self._clip_id)
+            clip.add(self.dwg.rect((0, 0), (width, height), rx=40, ry=40))
+            self.dwg.defs.add(clip)
+        return self._clip_id
+
+    def add(self, element):
+        bbox = self.bbox(element)
+        if bbox is None:
+            return self.dwg.add(element)
+        width, height = self.frame
+        left, top, right, bottom = bbox
+        if right <= 0 or bottom <= 0 or left >= width or top >= height:
+            self.culled.append({'element': element, 'bbox': bbox})
+            return element
+        if left < 0 or top < 0 or right > width or bottom > height:
+            self.clipped += 1
+            group = self.dwg.g(clip_path=f'url(#{self.clip_id()})')
+            group.add(element)
+            return self.dwg.add(group)
+        return self.dwg.add(element)
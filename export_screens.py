@@ -0,0 +1,151 @@
+"""Render wireframe screens to SVG files without a Streamlit server.
+
+    python export_screens.py [SCREEN ...] [--out DIR] [--jobs N]
+        [--size WxH ...] [--device NAME|all ...] [--palette NAME=FILE.json ...]
+        [--backend fast|svgwrite|columnar] [--symbols] [--stylesheet] [--css-vars]
+
+Every combination of screen and palette is one job rendering all requested
+sizes in a single batch (see batch.py); with --jobs N the jobs are spread
+across N worker processes. With --css-vars each screen is rendered once
+with CSS variable colors and every palette only adds its <style> rule.
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from batch import DEVICES, render_sizes
+from themes import LIGHT, apply_palette
+from wireframes import BACKENDS, SCREENS, UserAppWireframes
+
+
+def parse_size(value):
+    """Parse a WxH device size such as 390x844"""
+    try:
+        width, height = (int(part) for part in value.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got {value!r}")
+    return width, height
+
+
+def parse_palette(value):
+    """Parse NAME=FILE.json into a (name, colors) pair"""
+    name, sep, path = value.partition('=')
+    if not sep:
+        name, path = os.path.splitext(os.path.basename(value))[0], value
+    with open(path) as f:
+        return name, json.load(f)
+
+
+def screen_filename(screen, size=None, palette=None):
+    """File name for a screen, qualified by size and palette when given"""
+    parts = [screen]
+    if palette:
+        parts.append(palette)
+    if size:
+        parts.append('{}x{}'.format(*size))
+    return '-'.join(parts) + '.svg'
+
+
+def render_all(wireframes, screen, sizes):
+    if sizes:
+        return render_sizes(wireframes, screen, sizes)
+    return [wireframes.render(screen)]
+
+
+def render_job(job):
+    """Render one screen at every size and palette to disk; runs inside a worker process"""
+    screen, options, sizes, palettes, paths = job
+    wireframes = UserAppWireframes(**options)
+    outputs = []
+    if options['css_vars']:
+        svgs = render_all(wireframes, screen, sizes)
+        for _, colors in palettes:
+            outputs.append([apply_palette(svg, {**LIGHT, **(colors or {})}) for svg in svgs])
+    else:
+        for _, colors in palettes:
+            wireframes.colors = {**LIGHT, **(colors or {})}
+            outputs.append(render_all(wireframes, screen, sizes))
+    results = []
+    for palette_paths, svgs in zip(paths, outputs):
+        for path, svg in zip(palette_paths, svgs):
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(svg)
+            results.append((path, len(svg)))
+    return results
+
+
+def build_jobs(args):
+    """Expand the command line into one job per screen and palette, or
+    per screen with --css-vars"""
+    options = {
+        'backend': args.backend,
+        'symbols': args.symbols,
+        'stylesheet': args.stylesheet,
+        'css_vars': args.css_vars
+    }
+    sizes = list(args.size or [])
+    for device in args.device or []:
+        names = DEVICES if device == 'all' else [device]
+        sizes.extend(DEVICES[name] for name in names if DEVICES[name] not in sizes)
+    palettes = args.palette or [(None, None)]
+    groups = [palettes] if args.css_vars else [[palette] for palette in palettes]
+    return [
+        (screen, options, sizes, group,
+         [[os.path.join(args.out, screen_filename(screen, size, name))
+           for size in sizes or [None]]
+          for name, _ in group])
+        for screen in args.screens
+        for group in groups
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('screens', nargs='*', metavar='SCREEN', default=list(SCREENS),
+                        help='create_* methods to render (default: all)')
+    parser.add_argument('--out', default='wireframes_svg', help='output directory')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='worker processes (0 = one per CPU)')
+    parser.add_argument('--size', type=parse_size, action='append',
+                        help='device size WxH, may be repeated')
+    parser.add_argument('--device', choices=sorted(DEVICES) + ['all'], action='append',
+                        help='named device size from batch.DEVICES, or all of them')
+    parser.add_argument('--palette', type=parse_palette, action='append',
+                        help='NAME=FILE.json color overrides, may be repeated')
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='fast')
+    parser.add_argument('--symbols', action='store_true',
+                        help='instance repeated geometry with <defs>/<use>')
+    parser.add_argument('--stylesheet', action='store_true',
+                        help='emit styles as CSS classes')
+    parser.add_argument('--css-vars', action='store_true',
+                        help='render once with CSS variable colors and add each palette as a <style> rule')
+    args = parser.parse_args(argv)
+    if args.css_vars and args.backend == 'svgwrite':
+        parser.error("--css-vars needs the fast or columnar backend")
+
+    unknown = sorted(set(args.screens) - set(SCREENS))
+    if unknown:
+        parser.error(f"unknown screens: {', '.join(unknown)}")
+    os.makedirs(args.out, exist_ok=True)
+
+    jobs = build_jobs(args)
+    start = time.perf_counter()
+    if args.jobs == 1:
+        results = [render_job(job) for job in jobs]
+    else:
+        workers = args.jobs or os.cpu_count()
+        chunksize = max(1, len(jobs) // (4 * workers))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(render_job, jobs, chunksize=chunksize))
+    results = [result for job_results in results for result in job_results]
+    for path, size in results:
+        print(f'{path} ({size} bytes)')
+    elapsed = time.perf_counter() - start
+    total = sum(size for _, size in results)
+    print(f'Rendered {len(results)} files, {total} bytes in {elapsed:.2f}s')
+
+
+if __name__ == "__main__":
+    main()
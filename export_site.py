@@ -0,0 +1,218 @@
+"""Export the user journey as a static site that needs no Python to serve.
+
+    python export_site.py [--out DIR] [--backend fast|svgwrite|columnar]
+    python export_site.py --serve [--out DIR] [--port 8000]
+
+Every screen is written once to assets/<screen>.<hash>.svg, named by a hash
+of its content, and index.html lays the sections out the way the app does.
+Asset URLs change whenever their content does, so assets are served as
+immutable for a year while index.html is revalidated on every visit. The
+_headers file states that for static hosts that read one (Netlify,
+Cloudflare Pages); --serve runs a local server applying the same policy,
+with the content hash as ETag.
+"""
+import argparse
+import hashlib
+import html
+import http.server
+import json
+import os
+import re
+from functools import partial
+
+from journey import FLOW_DESCRIPTION, NEXT_SCREENS, SCREEN_SECTIONS, SECTIONS
+from wireframes import BACKENDS, SCREENS, UserAppWireframes
+
+ASSET_DIR = 'assets'
+HASH_LENGTH = 12
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'no-cache'
+
+HEADERS_FILE = f"""\
+/{ASSET_DIR}/*
+  Cache-Control: {IMMUTABLE}
+/*
+  Cache-Control: {REVALIDATE}
+"""
+
+PAGE = """\
+<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>User Journey Wireframes</title>
+<style>
+body {{ background-color: #1E1E1E; color: #FFFFFF; font-family: sans-serif; margin: 2rem; }}
+.screens {{ display: flex; gap: 2rem; flex-wrap: wrap; }}
+.screen img {{ display: block; }}
+a {{ color: #4DA3FF; }}
+</style>
+</head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def asset_name(screen, svg):
+    """Content-addressed path of a screen's SVG, relative to the site root"""
+    return f'{ASSET_DIR}/{screen}.{content_hash(svg.encode("utf-8"))}.svg'
+
+
+def write_assets(wireframes, out):
+    """Render every screen into out/assets, returning {screen: (path, etag)}"""
+    os.makedirs(os.path.join(out, ASSET_DIR), exist_ok=True)
+    manifest = {}
+    for screen in SCREENS:
+        svg = wireframes.render(screen)
+        path = asset_name(screen, svg)
+        target = os.path.join(out, path)
+        # Same name means same content, so an existing file is already right
+        if not os.path.exists(target):
+            write_atomic(target, svg)
+        manifest[screen] = {'path': path, 'etag': f'"{path.rsplit(".", 2)[1]}"', 'bytes': len(svg)}
+    return manifest
+
+
+def write_atomic(path, text):
+    temporary = f'{path}.tmp'
+    with open(temporary, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(temporary, path)
+
+
+def section_id(name):
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
+
+
+def inline_markdown(text):
+    return re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', html.escape(text))
+
+
+def markdown_to_html(text):
+    """HTML for the headings, numbered items and bullets FLOW_DESCRIPTION uses"""
+    parts, in_list = [], False
+    for line in text.splitlines():
+        bullet = line.startswith('- ')
+        if in_list and not bullet:
+            parts.append('</ul>')
+            in_list = False
+        if not line.strip():
+            continue
+        if line.startswith('### '):
+            parts.append(f'<h3>{inline_markdown(line[4:])}</h3>')
+        elif bullet:
+            if not in_list:
+                parts.append('<ul>')
+                in_list = True
+            parts.append(f'<li>{inline_markdown(line[2:])}</li>')
+        else:
+            parts.append(f'<p>{inline_markdown(line)}</p>')
+    if in_list:
+        parts.append('</ul>')
+    return '\n'.join(parts)
+
+
+def render_page(wireframes, manifest):
+    """index.html: every journey section with its screens and Next links"""
+    width, height = wireframes.screen_width, wireframes.screen_height
+    body = []
+    for name, screens in SECTIONS:
+        body.append(f'<section id="{section_id(name)}">')
+        body.append(f'<h1>User Journey - {html.escape(name)}</h1>')
+        body.append('<div class="screens">')
+        for subheader, screen, next_label in screens:
+            body.append('<div class="screen">')
+            if subheader:
+                body.append(f'<h2>{html.escape(subheader)}</h2>')
+            body.append(
+                f'<img src="{manifest[screen]["path"]}" width="{width}" height="{height}" '
+                f'alt="{html.escape(subheader or name)}">'
+            )
+            if next_label:
+                target = section_id(SCREEN_SECTIONS[NEXT_SCREENS[next_label]])
+                body.append(f'<p><strong>Next:</strong> <a href="#{target}">{html.escape(next_label)}</a></p>')
+            body.append('</div>')
+        body.append('</div>')
+        body.append('</section>')
+    body.append(markdown_to_html(FLOW_DESCRIPTION))
+    return PAGE.format(body='\n'.join(body))
+
+
+def export_site(wireframes, out):
+    """Write the whole site to out and return the asset manifest"""
+    manifest = write_assets(wireframes, out)
+    write_atomic(os.path.join(out, 'index.html'), render_page(wireframes, manifest))
+    write_atomic(os.path.join(out, '_headers'), HEADERS_FILE)
+    write_atomic(os.path.join(out, 'manifest.json'), json.dumps(manifest, indent=2, sort_keys=True))
+    return manifest
+
+
+class SiteHandler(http.server.SimpleHTTPRequestHandler):
+    """Serves an exported site with its cache policy and content-hash ETags"""
+
+    status = None
+
+    def asset_etag(self):
+        """ETag of the requested asset, or None unless it is one that exists"""
+        match = re.search(r'\.([0-9a-f]{%d})\.svg$' % HASH_LENGTH, self.path.split('?')[0])
+        if (
+            self.path.startswith(f'/{ASSET_DIR}/') and match
+            and os.path.isfile(self.translate_path(self.path))
+        ):
+            return f'"{match.group(1)}"'
+        return None
+
+    def send_head(self):
+        etag = self.asset_etag()
+        if etag is not None and etag in self.headers.get('If-None-Match', ''):
+            self.send_response(304)
+            self.end_headers()
+            return None
+        return super().send_head()
+
+    def send_response(self, code, message=None):
+        self.status = code
+        super().send_response(code, message)
+
+    def end_headers(self):
+        # Errors are never cached for long: the asset may be deployed next
+        etag = self.asset_etag() if self.status in (200, 304) else None
+        if etag is not None:
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', IMMUTABLE)
+        else:
+            self.send_header('Cache-Control', REVALIDATE)
+        super().end_headers()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--out', default='wireframes_site', help='output directory')
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='fast')
+    parser.add_argument('--serve', action='store_true', help='serve --out instead of exporting')
+    parser.add_argument('--port', type=int, default=8000)
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        handler = partial(SiteHandler, directory=args.out)
+        with http.server.ThreadingHTTPServer(('', args.port), handler) as server:
+            print(f'Serving {args.out} on http://localhost:{args.port}/')
+            server.serve_forever()
+        return
+
+    # Each screen is its own document, so ids cannot collide across them
+    wireframes = UserAppWireframes(backend=args.backend, symbols=True, stylesheet=True, cull=True)
+    manifest = export_site(wireframes, args.out)
+    total = sum(entry['bytes'] for entry in manifest.values())
+    print(f'Exported {len(manifest)} screens, {total} bytes of SVG, to {args.out}/index.html')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Direct-to-string SVG backend with the drawing surface the screens use.
+
+Element factories format their markup immediately and ``add`` appends it to
+a buffer, so no element tree is built and no attribute validation runs.
+Output matches svgwrite byte for byte for the attributes the screens use.
+"""
+
+SVG_HEADER = (
+    '<svg baseProfile="full" height="{height}" version="1.1" width="{width}" '
+    'xmlns="http://www.w3.org/2000/svg" '
+    'xmlns:ev="http://www.w3.org/2001/xml-events" '
+    'xmlns:xlink="http://www.w3.org/1999/xlink">'
+)
+
+
+def escape_text(value):
+    """Escape character data the way ElementTree does"""
+    value = str(value)
+    if '&' in value:
+        value = value.replace('&', '&amp;')
+    if '<' in value:
+        value = value.replace('<', '&lt;')
+    if '>' in value:
+        value = value.replace('>', '&gt;')
+    return value
+
+
+def escape_attrib(value):
+    """Escape an attribute value the way ElementTree does"""
+    value = escape_text(value)
+    if '"' in value:
+        value = value.replace('"', '&quot;')
+    if '\n' in value:
+        value = value.replace('\n', '&#10;')
+    return value
+
+
+def format_attribs(attribs):
+    """Format attributes sorted by name, dropping None and empty values"""
+    parts = []
+    for name, value in sorted(attribs.items()):
+        if value is None:
+            continue
+        value = str(value)
+        if value:
+            parts.append(f' {name}="{escape_attrib(value)}"')
+    return ''.join(parts)
+
+
+def svg_name(key):
+    """Translate a keyword argument into an SVG attribute name"""
+    return key.rstrip('_').replace('_', '-')
+
+
+def format_element(tag, attribs, content=None):
+    """Format a complete element"""
+    if content is None:
+        return f'<{tag}{format_attribs(attribs)} />'
+    return f'<{tag}{format_attribs(attribs)}>{escape_text(content)}</{tag}>'
+
+
+class Group:
+    """Container whose children are serialized when the drawing is"""
+
+    def __init__(self, tag='g', **extra):
+        self.tag = tag
+        self.attribs = {svg_name(key): value for key, value in extra.items()}
+        self.elements = []
+
+    def add(self, fragment):
+        self.elements.append(fragment)
+        return fragment
+
+    def __str__(self):
+        if not self.elements:
+            return f'<{self.tag}{format_attribs(self.attribs)} />'
+        children = ''.join(map(str, self.elements))
+        return f'<{self.tag}{format_attribs(self.attribs)}>{children}</{self.tag}>'
+
+
+class Drawing:
+    """Drawing that appends pre-formatted SVG fragments to a buffer"""
+
+    def __init__(self, size=('100%', '100%'), stylesheet=None, **extra):
+        self.width, self.height = size
+        self.stylesheet = stylesheet
+        self.defs = Group('defs')
+        self.elements = []
+
+    def element(self, tag, attribs, extra, content=None):
+        """Format an element from positional attribs and keyword extras"""
+        for key, value in extra.items():
+            attribs[svg_name(key)] = value
+        if self.stylesheet is not None:
+            self.stylesheet.classify(attribs)
+        return format_element(tag, attribs, content)
+
+    def add(self, fragment):
+        self.elements.append(fragment)
+        return fragment
+
+    def g(self, **extra):
+        return Group('g', **extra)
+
+    def clipPath(self, **extra):
+        return Group('clipPath', **extra)
+
+    def use(self, href, insert=None, **extra):
+        attribs = {'xlink:href': href}
+        if insert is not None:
+            attribs['x'], attribs['y'] = insert
+        return self.element('use', attribs, extra)
+
+    def rect(self, insert=(0, 0), size=(1, 1), **extra):
+        x, y = insert
+        width, height = size
+        return self.element('rect', {'x': x, 'y': y, 'width': width, 'height': height}, extra)
+
+    def circle(self, center=(0, 0), r=1, **extra):
+        cx, cy = center
+        return self.element('circle', {'cx': cx, 'cy': cy, 'r': r}, extra)
+
+    def text(self, text, insert=None, **extra):
+        attribs = {}
+        if insert is not None:
+            attribs['x'], attribs['y'] = insert
+        return self.element('text', attribs, extra, content=text)
+
+    def path(self, d=None, **extra):
+        return self.element('path', {'d': d}, extra)
+
+    def tostring(self):
+        header = SVG_HEADER.format(width=self.width, height=self.height)
+        defs = self.defs
+        if self.stylesheet:
+            defs = Group('defs')
+            defs.elements = [f'<style>{escape_text(self.stylesheet.css())}</style>'] + self.defs.elements
+        return header + str(defs) + ''.join(map(str, self.elements)) + '</svg>'
@@ -0,0 +1,133 @@
+"""Find which wireframe element sits at a point of a rendered screen.
+
+inspect_screen() builds a screen through InspectingDrawing, which records
+for every element added to the drawing its role, bounding box, text and
+the screen that drew it. Roles are what the wireframes' helpers declare
+their elements part of (UserAppWireframes.part and the draws decorator),
+falling back to the element's tag. The records go into a GridIndex, a
+uniform grid of buckets over the screen, so a hit test only checks the
+few elements whose box overlaps the bucket containing the point.
+"""
+import copy
+
+from culling import BoundsDrawing, intersection
+
+
+class ElementInfo:
+    """What is known about one element of a rendered screen"""
+
+    __slots__ = ('role', 'tag', 'bounds', 'text', 'source', 'order')
+
+    def __init__(self, role, tag, bounds, text, source, order):
+        self.role = role
+        self.tag = tag
+        self.bounds = bounds
+        self.text = text
+        self.source = source
+        # Paint order; later elements are drawn on top
+        self.order = order
+
+    def contains(self, x, y):
+        left, top, right, bottom = self.bounds
+        return left <= x <= right and top <= y <= bottom
+
+    def __repr__(self):
+        return f'ElementInfo({self.role!r}, {self.tag!r}, {self.bounds!r}, {self.text!r}, {self.source!r})'
+
+
+class InspectingDrawing(BoundsDrawing):
+    """Drawing proxy collecting an ElementInfo for every top-level element
+
+    parts is the wireframes' stack of roles being drawn, read as each
+    element is created.
+    """
+
+    def __init__(self, dwg, source=None, parts=()):
+        super().__init__(dwg)
+        self.source = source
+        self.parts = parts
+        self.infos = []
+        # id(element) -> (tag, role, source, text) from when it was created
+        self._created = {}
+
+    def _created_by(self, element, tag, text=None):
+        role = self.parts[-1] if self.parts else tag
+        self._created[id(element)] = (tag, role, self.source, text)
+        return element
+
+    def rect(self, insert=(0, 0), size=(1, 1), **extra):
+        return self._created_by(super().rect(insert, size, **extra), 'rect')
+
+    def circle(self, center=(0, 0), r=1, **extra):
+        return self._created_by(super().circle(center, r, **extra), 'circle')
+
+    def text(self, text, insert=None, **extra):
+        return self._created_by(super().text(text, insert=insert, **extra), 'text', str(text))
+
+    def path(self, d=None, **extra):
+        return self._created_by(super().path(d=d, **extra), 'path')
+
+    def use(self, href, insert=None, **extra):
+        return self._created_by(super().use(href, insert=insert, **extra), 'use')
+
+    def add(self, element):
+        self._record(element, None)
+        return self.dwg.add(element)
+
+    def _record(self, element, clip):
+        created = self._created.get(id(element))
+        if created is None:
+            # A clipped group, such as a scrolled list's rows: its children
+            # are what is seen, cut to the clip
+            box = self.clip_box(element)
+            if box is None:
+                return
+            clip = box if clip is None else intersection(clip, box)
+            if clip is not None:
+                for child in element.elements:
+                    self._record(child, clip)
+            return
+        bbox = self.bbox(element)
+        if clip is not None:
+            bbox = intersection(bbox, clip)
+        if bbox is not None:
+            tag, role, source, text = created
+            self.infos.append(ElementInfo(role, tag, bbox, text, source, len(self.infos)))
+
+
+class GridIndex:
+    """Uniform grid over element boxes answering point queries"""
+
+    def __init__(self, infos, cell_size=32):
+        self.infos = list(infos)
+        self.cell_size = cell_size
+        self.cells = {}
+        for info in self.infos:
+            left, top, right, bottom = (int(v // cell_size) for v in info.bounds)
+            for cx in range(left, right + 1):
+                for cy in range(top, bottom + 1):
+                    self.cells.setdefault((cx, cy), []).append(info)
+
+    def __len__(self):
+        return len(self.infos)
+
+    def hit(self, x, y):
+        """Elements containing (x, y), topmost first"""
+        bucket = self.cells.get((int(x // self.cell_size), int(y // self.cell_size)), ())
+        return sorted(
+            (info for info in bucket if info.contains(x, y)),
+            key=lambda info: info.order, reverse=True
+        )
+
+
+def inspect_screen(wireframes, screen, **params):
+    """GridIndex of the elements of one screen built with wireframes' settings"""
+    inspector = copy.copy(wireframes)
+    # Every element is indexed, including those culling would drop
+    inspector.cull = False
+    inspector.parts = []
+    # Cached layouts draw through the instance that built them
+    inspector.layouts = {}
+    inspector.new_drawing = lambda: InspectingDrawing(wireframes.new_drawing(), screen, inspector.parts)
+    dwg = inspector.build(screen, **params)
+    return GridIndex(dwg.infos)
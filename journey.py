@@ -0,0 +1,117 @@
+"""Layout of the user journey page, independent of Streamlit."""
+
+# Each section is (flow name, screens); each screen is
+# (subheader, create_* method, label of the next step). A section with a
+# single screen is shown full width without a subheader.
+SECTIONS = (
+    ('Welcome Flow', (
+        (None, 'create_welcome_screen', None),
+    )),
+    ('Discovery Flow', (
+        ('Discovery Screen', 'create_user_discovery_screen', 'Playlist Creation'),
+        ('Playlist Screen', 'create_playlist_screen', 'Community'),
+    )),
+    ('Engagement Flow', (
+        ('Community Feed', 'create_engagement_screen', 'Events'),
+        ('Events', 'create_events_screen', 'Premium Features'),
+    )),
+    ('Premium Features', (
+        ('Premium Features', 'create_premium_features_screen', 'Exclusive Content'),
+        ('Exclusive Content', 'create_exclusive_content_screen', None),
+    )),
+    ('Content Management', (
+        ('My Library', 'create_user_content_screen', 'Favorites'),
+        ('Favorites', 'create_user_favorites_screen', 'Community'),
+    )),
+    ('Profile & Analytics', (
+        ('Analytics', 'create_user_analytics_screen', 'Profile'),
+        ('Profile', 'create_user_profile_screen', None),
+    )),
+    ('Profile & Preferences', (
+        ('User Profile', 'create_user_profile_screenb', 'Preferences'),
+        ('User Preferences', 'create_user_preferences_screen', None),
+    )),
+)
+
+SECTION_NAMES = tuple(name for name, _ in SECTIONS)
+
+# Markdown shown below the screens
+FLOW_DESCRIPTION = """\
+### User Journey Flow Description
+
+1. **Registration Flow**
+- Welcome → Account Creation → Profile Setup
+- Sign up and personalize experience
+
+2. **Discovery Flow**
+- Browse Athletes → Search Interface → Playlist Creation
+- Find and collect favorite music
+
+3. **Engagement Flow**
+- Community Feed → Events Calendar
+- Connect with athletes and attend events
+
+4. **Premium Features**
+- Premium Plans → Exclusive Content
+- Access VIP features and special events
+
+5. **Content Access**
+- Library Management → Favorites
+- Organize personal collection and playlists
+
+This journey flow shows:
+- Clear user progression from registration to premium features
+- Focus on discovery and engagement
+- Emphasis on community participation
+- Path to exclusive content access
+"""
+
+# Screen each "Next" label leads to
+NEXT_SCREENS = {
+    'Playlist Creation': 'create_playlist_screen',
+    'Community': 'create_engagement_screen',
+    'Events': 'create_events_screen',
+    'Premium Features': 'create_premium_features_screen',
+    'Exclusive Content': 'create_exclusive_content_screen',
+    'Favorites': 'create_user_favorites_screen',
+    'Profile': 'create_user_profile_screen',
+    'Preferences': 'create_user_preferences_screen',
+}
+
+# Transitions the flow description adds beyond the "Next" labels: the
+# registration flow leads into discovery
+EXTRA_TRANSITIONS = (
+    ('create_welcome_screen', 'create_user_discovery_screen', 'Discovery'),
+)
+
+# Navigation graph edges as (screen, next screen, label), most likely first
+TRANSITIONS = tuple(
+    (screen, NEXT_SCREENS[label], label)
+    for _, screens in SECTIONS
+    for _, screen, label in screens
+    if label
+) + EXTRA_TRANSITIONS
+
+# Adjacency: screen -> screens reachable in one step
+NAVIGATION = {}
+for screen, target, _ in TRANSITIONS:
+    NAVIGATION.setdefault(screen, []).append(target)
+NAVIGATION = {screen: tuple(targets) for screen, targets in NAVIGATION.items()}
+
+# Section each screen is shown in
+SCREEN_SECTIONS = {
+    screen: name
+    for name, screens in SECTIONS
+    for _, screen, _ in screens
+}
+
+
+def next_screens(screens):
+    """Screens one step away from any of screens that are not among them"""
+    shown = set(screens)
+    following = []
+    for screen in screens:
+        for target in NAVIGATION.get(screen, ()):
+            if target not in shown and target not in following:
+                following.append(target)
+    return following
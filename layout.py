@@ -0,0 +1,157 @@
+"""Stack layout for wireframe screens.
+
+A layout is a tree of Box leaves inside VStack/HStack containers. Sizes are
+a number of pixels (fixed), 'fill' (share the space left along the stack's
+axis, or stretch across it) or None (fit the content). place() runs one
+measure pass up the tree and one arrange pass down it, then returns the
+absolute frame of every node so each can draw itself.
+
+Nodes cache their measured size and arranged child frames per constraint,
+so a tree that is kept between renders only recomputes subtrees whose
+available space changed; fully fixed-size subtrees never recompute.
+"""
+FILL = 'fill'
+
+
+class Box:
+    """Leaf node; draw(dwg, x, y, width, height) paints it once placed"""
+
+    def __init__(self, width=None, height=None, draw=None):
+        self.width = width
+        self.height = height
+        self.draw = draw
+        self.children = ()
+
+    @property
+    def fixed(self):
+        """True when the node's size does not depend on its constraints"""
+        return not (self.width == FILL or self.height == FILL)
+
+    def measure(self, max_width, max_height):
+        """Natural (width, height) of the node within the given space"""
+        return (
+            resolve(self.width, max_width, 0),
+            resolve(self.height, max_height, 0)
+        )
+
+    def arrange(self, width, height):
+        """Child frames relative to this node, as (node, x, y, w, h) tuples"""
+        return ()
+
+
+class Stack(Box):
+    """Container laying its children out along one axis"""
+
+    vertical = True
+
+    def __init__(self, children, gap=0, padding=0, width=None, height=None, draw=None):
+        super().__init__(width, height, draw)
+        self.children = tuple(children)
+        self.gap = gap
+        self.padding = padding
+        self._fixed = (
+            super().fixed
+            and self.width is not None and self.height is not None
+            and all(child.fixed for child in self.children)
+        )
+        self._measured = {}
+        self._arranged = {}
+
+    @property
+    def fixed(self):
+        return self._fixed
+
+    def _main(self, size):
+        return size[1] if self.vertical else size[0]
+
+    def _cross(self, size):
+        return size[0] if self.vertical else size[1]
+
+    def _pair(self, main, cross):
+        return (cross, main) if self.vertical else (main, cross)
+
+    def measure(self, max_width, max_height):
+        key = None if self.fixed else (max_width, max_height)
+        if key not in self._measured:
+            inner = self._pair(
+                self._main((max_width, max_height)) - 2*self.padding,
+                self._cross((max_width, max_height)) - 2*self.padding
+            )
+            sizes = [child.measure(*inner) for child in self.children]
+            # Fill children take no space until the arrange pass shares it out
+            main = sum(
+                self._main(size) for child, size in zip(self.children, sizes)
+                if self._main((child.width, child.height)) != FILL
+            )
+            main += self.gap * max(len(sizes) - 1, 0) + 2*self.padding
+            cross = max((self._cross(size) for size in sizes), default=0) + 2*self.padding
+            natural = self._pair(main, cross)
+            self._measured[key] = (
+                resolve(self.width, max_width, natural[0]),
+                resolve(self.height, max_height, natural[1])
+            )
+        return self._measured[key]
+
+    def arrange(self, width, height):
+        key = (width, height)
+        if key not in self._arranged:
+            main_size = self._main((width, height)) - 2*self.padding
+            cross_size = self._cross((width, height)) - 2*self.padding
+            inner = self._pair(main_size, cross_size)
+            sizes = [child.measure(*inner) for child in self.children]
+            fills = [self._main((child.width, child.height)) == FILL for child in self.children]
+
+            # Fill children share whatever the others leave on the main axis
+            used = sum(self._main(size) for size, fill in zip(sizes, fills) if not fill)
+            used += self.gap * max(len(sizes) - 1, 0)
+            share = max(main_size - used, 0) / max(sum(fills), 1)
+
+            frames = []
+            offset = self.padding
+            for child, size, fill in zip(self.children, sizes, fills):
+                main = share if fill else self._main(size)
+                cross_spec = self._cross((child.width, child.height))
+                cross = cross_size if cross_spec == FILL else self._cross(size)
+                x, y = self._pair(offset, self.padding)
+                child_width, child_height = self._pair(main, cross)
+                frames.append((child, x, y, child_width, child_height))
+                offset += main + self.gap
+            self._arranged[key] = tuple(frames)
+        return self._arranged[key]
+
+
+class VStack(Stack):
+    vertical = True
+
+
+class HStack(Stack):
+    vertical = False
+
+
+def resolve(spec, available, natural):
+    """Concrete size for a width/height spec"""
+    if spec == FILL:
+        return available
+    if spec is None:
+        return natural
+    return spec
+
+
+def place(root, x, y, width, height):
+    """Absolute (node, x, y, w, h) for root and every descendant, in paint order"""
+    frames = []
+
+    def visit(node, node_x, node_y, node_width, node_height):
+        frames.append((node, node_x, node_y, node_width, node_height))
+        for child, child_x, child_y, child_width, child_height in node.arrange(node_width, node_height):
+            visit(child, node_x + child_x, node_y + child_y, child_width, child_height)
+
+    visit(root, x, y, *root.measure(width, height))
+    return frames
+
+
+def draw_layout(dwg, root, x, y, width, height):
+    """Place a layout tree and let every node with a draw callback paint itself"""
+    for node, node_x, node_y, node_width, node_height in place(root, x, y, width, height):
+        if node.draw is not None:
+            node.draw(dwg, node_x, node_y, node_width, node_height)
@@ -0,0 +1,255 @@
+"""Lint rendered screens for overlapping, overflowing and off-frame elements.
+
+    python lint.py [SCREEN ...] [--size WxH ...] [--device NAME|all ...]
+        [--items N ...] [--scroll PX ...] [--ignore KIND ...]
+
+Every combination of screen, size and list parameters is one variant. Each
+variant is built through hit_test's InspectingDrawing and its elements are
+checked for:
+
+    frame     an element extends past the phone frame
+    overlap   two shapes partially overlap, or two texts overlap
+    overflow  a text crosses the edge of a shape it sits on
+
+Shapes that fully contain another element (a card and its label) are not
+reported. Overlaps are found with a sweep over the elements' left and right
+edges; the elements the sweep line crosses are indexed by their vertical
+extent, so each one is only compared with those overlapping it on both
+axes and a variant costs O((n + pairs) log n). Exits non-zero when any
+issue is found.
+"""
+import argparse
+import sys
+from bisect import bisect_left, bisect_right, insort
+
+from batch import DEVICES
+from export_screens import parse_size
+from hit_test import inspect_screen
+from wireframes import BACKENDS, LIST_SCREENS, SCREENS, UserAppWireframes
+
+KINDS = ('frame', 'overlap', 'overflow')
+
+# Text boxes come from font metrics, so allow this much slack in px
+TOLERANCE = 1
+
+# Roles drawn behind everything else, never part of an overlap
+BACKGROUND_ROLES = ('base screen',)
+
+
+class Issue:
+    """One problem found in a screen variant"""
+
+    def __init__(self, kind, variant, element, other=None):
+        self.kind = kind
+        self.variant = variant
+        self.element = element
+        self.other = other
+
+    def __str__(self):
+        screen, size, params = self.variant
+        where = f"{screen} {size[0]}x{size[1]}"
+        if params:
+            where += ' ' + ' '.join(f'{key}={value}' for key, value in sorted(params.items()))
+        message = f'{where}: {self.kind}: {describe(self.element)}'
+        if self.other is not None:
+            message += f' / {describe(self.other)}'
+        return message
+
+
+def describe(info):
+    left, top, right, bottom = info.bounds
+    label = f'{info.role} <{info.tag}>'
+    if info.text:
+        label += f' "{info.text}"'
+    return f'{label} ({left:.0f},{top:.0f})-({right:.0f},{bottom:.0f})'
+
+
+def contains(outer, inner, tolerance=TOLERANCE):
+    return (
+        outer[0] - tolerance <= inner[0] and outer[1] - tolerance <= inner[1]
+        and inner[2] <= outer[2] + tolerance and inner[3] <= outer[3] + tolerance
+    )
+
+
+def intersects(a, b, tolerance=TOLERANCE):
+    """True when the boxes share more than a tolerance-wide sliver"""
+    return (
+        min(a[2], b[2]) - max(a[0], b[0]) > tolerance
+        and min(a[3], b[3]) - max(a[1], b[1]) > tolerance
+    )
+
+
+class IntervalSet:
+    """Vertical extents of the elements a sweep line crosses
+
+    A segment tree over every top and bottom holds each extent in the
+    O(log n) nodes covering it, answering which extents span a point; a
+    list sorted by top answers which start inside a range. Together they
+    find the extents overlapping a range without visiting any others.
+    """
+
+    def __init__(self, extents):
+        self.extents = extents
+        self.coords = sorted({value for extent in extents for value in extent})
+        self.size = 1
+        while self.size < len(self.coords):
+            self.size *= 2
+        # Segment tree node -> indexes of the extents stored there
+        self.nodes = {}
+        self.tops = []
+        # Stored extents read by overlapping(), a measure of sweep work
+        self.examined = 0
+
+    def covering_nodes(self, i):
+        """Nodes whose leaves, [coords[k], coords[k + 1]), tile extent i"""
+        top, bottom = self.extents[i]
+        low = bisect_left(self.coords, top) + self.size
+        high = bisect_left(self.coords, bottom) + self.size
+        while low < high:
+            if low & 1:
+                yield low
+                low += 1
+            if high & 1:
+                high -= 1
+                yield high
+            low >>= 1
+            high >>= 1
+
+    def add(self, i):
+        for node in self.covering_nodes(i):
+            self.nodes.setdefault(node, set()).add(i)
+        insort(self.tops, (self.extents[i][0], i))
+
+    def discard(self, i):
+        for node in self.covering_nodes(i):
+            self.nodes[node].discard(i)
+        del self.tops[bisect_left(self.tops, (self.extents[i][0], i))]
+
+    def overlapping(self, top, bottom):
+        """Indexes of the extents sharing part of (top, bottom)"""
+        # Extents spanning top, from the root down to its leaf
+        found = []
+        node = bisect_left(self.coords, top) + self.size
+        while node:
+            found.extend(self.nodes.get(node, ()))
+            node >>= 1
+        self.examined += len(found)
+        # Extents starting below top and above bottom, walked in place
+        tops = self.tops
+        for k in range(bisect_right(tops, (top, len(self.extents))), len(tops)):
+            self.examined += 1
+            other_top, j = tops[k]
+            if other_top >= bottom:
+                break
+            found.append(j)
+        return found
+
+
+def overlapping_pairs(infos, stats=None):
+    """Yield every pair of intersecting elements with a left-to-right sweep
+
+    Edges are sorted once. The elements the sweep line currently crosses
+    are kept in an IntervalSet, so each element entering it is only
+    compared with those it overlaps vertically too. When a stats dict is
+    passed, its 'examined' is set to the number of stored extents the
+    sweep read once it finishes.
+    """
+    # At equal x an element starts before any ends, so zero-width ones are
+    # added before they are removed
+    events = sorted(
+        [(info.bounds[0], 0, i) for i, info in enumerate(infos)]
+        + [(info.bounds[2], 1, i) for i, info in enumerate(infos)]
+    )
+    active = IntervalSet([(info.bounds[1], info.bounds[3]) for info in infos])
+    for _, ends, i in events:
+        if ends:
+            active.discard(i)
+            continue
+        for j in active.overlapping(infos[i].bounds[1], infos[i].bounds[3]):
+            if intersects(infos[i].bounds, infos[j].bounds):
+                yield infos[min(i, j)], infos[max(i, j)]
+        active.add(i)
+    if stats is not None:
+        stats['examined'] = active.examined
+
+
+def check(infos, width, height, variant):
+    """Issues among one variant's elements"""
+    issues = []
+    frame = (0, 0, width, height)
+    for info in infos:
+        if not contains(frame, info.bounds):
+            issues.append(Issue('frame', variant, info))
+
+    elements = [info for info in infos if info.role not in BACKGROUND_ROLES]
+    for a, b in overlapping_pairs(elements):
+        if contains(a.bounds, b.bounds) or contains(b.bounds, a.bounds):
+            continue
+        texts = (a.tag == 'text') + (b.tag == 'text')
+        if texts == 1:
+            text, shape = (a, b) if a.tag == 'text' else (b, a)
+            issues.append(Issue('overflow', variant, text, shape))
+        else:
+            issues.append(Issue('overlap', variant, a, b))
+    return issues
+
+
+def lint_variant(wireframes, screen, size, params):
+    wireframes.screen_width, wireframes.screen_height = size
+    index = inspect_screen(wireframes, screen, **params)
+    return check(index.infos, size[0], size[1], (screen, size, params))
+
+
+def variants(args):
+    sizes = list(args.size or [])
+    for device in args.device or []:
+        names = DEVICES if device == 'all' else [device]
+        sizes.extend(DEVICES[name] for name in names if DEVICES[name] not in sizes)
+    sizes = sizes or [(360, 640)]
+    list_params = [
+        {key: value for key, value in (('item_count', items), ('scroll_offset', scroll))
+         if value is not None}
+        for items in args.items or [None]
+        for scroll in args.scroll or [None]
+    ]
+    for screen in args.screens:
+        for size in sizes:
+            for params in list_params if screen in LIST_SCREENS else [{}]:
+                yield screen, size, params
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('screens', nargs='*', metavar='SCREEN', default=list(SCREENS),
+                        help='create_* methods to lint (default: all)')
+    parser.add_argument('--size', type=parse_size, action='append',
+                        help='device size WxH, may be repeated')
+    parser.add_argument('--device', choices=sorted(DEVICES) + ['all'], action='append',
+                        help='named device size from batch.DEVICES, or all of them')
+    parser.add_argument('--items', type=int, action='append',
+                        help='item count for list screens, may be repeated')
+    parser.add_argument('--scroll', type=int, action='append',
+                        help='scroll offset for list screens, may be repeated')
+    parser.add_argument('--ignore', choices=KINDS, action='append', default=[],
+                        help='issue kind to skip, may be repeated')
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='fast')
+    args = parser.parse_args(argv)
+
+    unknown = sorted(set(args.screens) - set(SCREENS))
+    if unknown:
+        parser.error(f"unknown screens: {', '.join(unknown)}")
+
+    wireframes = UserAppWireframes(backend=args.backend)
+    count = issues = 0
+    for screen, size, params in variants(args):
+        count += 1
+        for issue in lint_variant(wireframes, screen, size, params):
+            if issue.kind not in args.ignore:
+                issues += 1
+                print(issue)
+    print(f'{issues} issues in {count} screen variants')
+    return 1 if issues else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,250 @@
+"""Load-test the app with many concurrent simulated sessions, no browser needed.
+
+    python loadtest.py [--sessions N ...] [--reruns N] [--flow NAME ...]
+        [--progressive] [--items N] [--cold] [--trace-memory] [--save FILE]
+
+For each --sessions level, that many sessions of svglofi2.py start together
+in one process, each in its own thread, and rerun the script --reruns times
+while cycling through the journey flows, like users clicking around. The
+shared render cache, prefetcher and render pool are process-wide, as on a
+server. Reported per level: rerun latency percentiles (request to script
+finished), reruns per second across all sessions, peak memory and errors.
+
+--cold clears the process-wide caches before each level; without it, later
+levels start with whatever the earlier ones rendered. Renders persisted in
+the on-disk bundle survive --cold; run with WIREFRAME_CACHE_DIR= to test
+without it. --trace-memory adds the Python heap peak from tracemalloc,
+which slows every rerun down.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from unittest.mock import MagicMock
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+import streamlit as st
+from streamlit.runtime import Runtime
+from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+from streamlit.runtime.media_file_manager import MediaFileManager
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+from streamlit.runtime.scriptrunner import RerunData, ScriptRunnerEvent
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1.element_tree import parse_tree_from_messages
+from streamlit.testing.v1.local_script_runner import LocalScriptRunner
+from streamlit.testing.v1.util import patch_config_options
+
+from benchmark import git_revision
+from journey import SECTION_NAMES
+from svglofi2 import ALL_FLOWS
+
+# The app, found from here so the test runs from any directory
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'svglofi2.py')
+PERCENTILES = (50, 90, 99)
+STOPPED = (
+    ScriptRunnerEvent.SCRIPT_STOPPED_WITH_SUCCESS,
+    ScriptRunnerEvent.SCRIPT_STOPPED_WITH_COMPILE_ERROR,
+    ScriptRunnerEvent.SCRIPT_STOPPED_FOR_RERUN,
+)
+
+
+@contextmanager
+def simulated_runtime():
+    """Install one mock Runtime for every session's runs
+
+    AppTest.run installs and removes its own around each run, which breaks
+    runs overlapping it in other threads.
+    """
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage('/mock/media'))
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    Runtime._instance = runtime
+    try:
+        with patch_config_options({'runner.postScriptGC': False}):
+            yield runtime
+    finally:
+        Runtime._instance = None
+
+
+class Session(AppTest):
+    """AppTest that can run alongside others and times every rerun
+
+    Needs simulated_runtime(). Finishing is signalled by the runner's events
+    rather than polled, so latencies are not rounded up to the poll interval.
+    """
+
+    def __init__(self, script_path, default_timeout=60):
+        super().__init__(script_path, default_timeout=default_timeout)
+        self.latencies = []
+        self.errors = 0
+
+    def _run(self, widget_state=None, timeout=None):
+        runner = LocalScriptRunner(self._script_path, self.session_state)
+        finished = threading.Event()
+
+        def on_event(sender, event, **kwargs):
+            if event in STOPPED:
+                finished.set()
+
+        runner.on_event.connect(on_event, weak=False)
+        start = time.perf_counter()
+        runner.request_rerun(RerunData(widget_states=widget_state))
+        runner.start()
+        if not finished.wait(timeout or self.default_timeout):
+            runner.request_stop()
+            runner.join()
+            raise RuntimeError(f'{self._script_path} rerun timed out')
+        self.latencies.append((time.perf_counter() - start) * 1000)
+        self._tree = parse_tree_from_messages(runner.forward_msgs())
+        self._tree._runner = self
+        if self.exception:
+            self.errors += 1
+        return self
+
+
+def labelled(elements, label):
+    return next(element for element in elements if element.label == label)
+
+
+def run_session(session, flows, reruns, progressive=False, items=None):
+    """One simulated user: open the app, set it up, then click through flows"""
+    session.run()
+    if progressive:
+        labelled(session.sidebar.checkbox, "Progressive rendering").check().run()
+    if items is not None:
+        labelled(session.sidebar.checkbox, "Override list sizes").check().run()
+        labelled(session.sidebar.number_input, "Items per list").set_value(items).run()
+    for i in range(reruns):
+        session.sidebar.radio[0].set_value(flows[i % len(flows)]).run()
+
+
+def peak_rss_mb():
+    """Process high-water RSS so far, or None where unavailable"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def percentile(samples, q):
+    """Nearest-rank percentile of sorted samples"""
+    rank = max(1, -(-q * len(samples) // 100))
+    return samples[rank - 1]
+
+
+def run_level(count, args):
+    """Run count sessions at once and summarise their reruns"""
+    if args.cold:
+        st.cache_resource.clear()
+    if args.trace_memory:
+        tracemalloc.reset_peak()
+    sessions = [Session(SCRIPT) for _ in range(count)]
+    failures = []
+    barrier = threading.Barrier(count)
+
+    def user(session, offset):
+        barrier.wait()
+        # Users start on different flows, as they would
+        flows = args.flow[offset % len(args.flow):] + args.flow[:offset % len(args.flow)]
+        try:
+            run_session(session, flows, args.reruns, args.progressive, args.items)
+        except Exception as exc:
+            failures.append(exc)
+
+    threads = [
+        threading.Thread(target=user, args=(session, i), name=f'session-{i}')
+        for i, session in enumerate(sessions)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(ms for session in sessions for ms in session.latencies)
+    result = {
+        'sessions': count,
+        'reruns': len(latencies),
+        'seconds': elapsed,
+        'throughput': len(latencies) / elapsed,
+        'max_ms': latencies[-1] if latencies else None,
+        'peak_rss_mb': peak_rss_mb(),
+        'traced_peak_mb': tracemalloc.get_traced_memory()[1] / 2 ** 20 if args.trace_memory else None,
+        'errors': sum(session.errors for session in sessions) + len(failures),
+    }
+    for q in PERCENTILES:
+        result[f'p{q}_ms'] = percentile(latencies, q) if latencies else None
+    return result
+
+
+def format_value(value, spec):
+    return f'{value:{spec}}' if value is not None else f"{'-':>{spec.split('.')[0]}}"
+
+
+def print_result(result):
+    print(
+        f"{result['sessions']:9d}{result['reruns']:8d}"
+        + ''.join(format_value(result[f'p{q}_ms'], '10.1f') for q in PERCENTILES)
+        + format_value(result['max_ms'], '10.1f')
+        + format_value(result['throughput'], '10.1f')
+        + format_value(result['peak_rss_mb'], '10.1f')
+        + format_value(result['traced_peak_mb'], '10.1f')
+        + f"{result['errors']:8d}"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 4, 16],
+                        help='concurrent session counts to test, in order')
+    parser.add_argument('--reruns', type=int, default=10, help='flow changes per session')
+    parser.add_argument('--flow', action='append', choices=SECTION_NAMES + (ALL_FLOWS,),
+                        help='flows sessions cycle through (default: all of them)')
+    parser.add_argument('--progressive', action='store_true', help='turn on progressive rendering')
+    parser.add_argument('--items', type=int, help='override list sizes with this item count')
+    parser.add_argument('--cold', action='store_true', help='clear shared caches before each level')
+    parser.add_argument('--trace-memory', action='store_true', help='also report the tracemalloc peak')
+    parser.add_argument('--save', metavar='FILE', help='write the results as JSON')
+    args = parser.parse_args(argv)
+    args.flow = args.flow or list(SECTION_NAMES + (ALL_FLOWS,))
+
+    if args.trace_memory:
+        tracemalloc.start()
+    print(
+        f"{'sessions':>9}{'reruns':>8}"
+        + ''.join(f"{f'p{q} ms':>10}" for q in PERCENTILES)
+        + f"{'max ms':>10}{'reruns/s':>10}{'RSS MB':>10}{'heap MB':>10}{'errors':>8}"
+    )
+    results = []
+    with simulated_runtime():
+        for count in args.sessions:
+            results.append(run_level(count, args))
+            print_result(results[-1])
+
+    if args.save:
+        meta = {
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            **{key: value for key, value in vars(args).items() if key not in ('sessions', 'save')},
+        }
+        with open(args.save, 'w') as f:
+            json.dump({'meta': meta, 'results': results}, f, indent=2)
+        print(f'\nSaved results to {args.save}')
+    return 1 if any(result['errors'] for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
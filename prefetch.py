@@ -0,0 +1,39 @@
+"""Render screens into a RenderCache ahead of time on background threads."""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Prefetcher:
+    """Queues screen renders on a small thread pool, skipping cached ones"""
+
+    def __init__(self, workers=1):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='prefetch')
+        self._lock = threading.Lock()
+        self._pending = set()
+        self.prefetched = 0
+
+    def prefetch(self, wireframes, cache, screen, **params):
+        """Render screen into cache in the background; returns the future or None"""
+        key = wireframes.cache_key(screen, params)
+        with self._lock:
+            if key in cache or key in self._pending:
+                return None
+            self._pending.add(key)
+
+        def job():
+            try:
+                wireframes.render(screen, cache, **params)
+                with self._lock:
+                    self.prefetched += 1
+            finally:
+                with self._lock:
+                    self._pending.discard(key)
+
+        return self._executor.submit(job)
+
+    def pending(self):
+        with self._lock:
+            return len(self._pending)
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,134 @@
+import threading
+from collections import OrderedDict
+
+
+class Flight:
+    """A render in progress that other callers can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.svg = None
+        self.error = None
+
+    def wait(self):
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.svg
+
+
+class RenderCache:
+    """Bounded LRU cache of rendered screen SVG strings
+
+    Safe to share between threads and sessions. get_or_render coalesces
+    concurrent misses: the first caller renders a key while later callers
+    wait for its result, so each key is rendered once however many ask.
+
+    With a store (such as a bundle_cache.BundleCache) misses are looked up
+    there before rendering and new renders are written to it, so renders
+    outlive the process.
+    """
+
+    def __init__(self, maxsize=64, max_bytes=8 * 1024 * 1024, store=None):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.coalesced = 0
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        # key -> Flight for renders in progress
+        self._flights = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        """Return the cached SVG for key, or None on a miss"""
+        with self._lock:
+            svg = self._entries.get(key)
+            if svg is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return svg
+
+    def put(self, key, svg):
+        """Store svg under key, evicting least recently used entries"""
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.nbytes -= len(old)
+            self._entries[key] = svg
+            self.nbytes += len(svg)
+            while self._entries and (
+                len(self._entries) > self.maxsize or self.nbytes > self.max_bytes
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self.nbytes -= len(evicted)
+                self.evictions += 1
+
+    def get_or_render(self, key, render):
+        """Return the cached SVG for key, calling render() on a miss
+
+        Callers missing a key another thread is already rendering wait for
+        that render instead of starting their own, and see its exception
+        if it fails.
+        """
+        with self._lock:
+            svg = self.get(key)
+            if svg is not None:
+                return svg
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = Flight()
+            else:
+                # The wait is not a second miss
+                self.misses -= 1
+                self.coalesced += 1
+        if not leader:
+            return flight.wait()
+
+        try:
+            svg = None if self.store is None else self.store.get(key)
+            if svg is None:
+                svg = render()
+                if self.store is not None:
+                    self.store.put(key, svg)
+            self.put(key, svg)
+            flight.svg = svg
+            return svg
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def clear(self):
+        """Drop all entries and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+            self.hits = self.misses = self.evictions = self.coalesced = 0
+
+    def stats(self):
+        """Return a snapshot of the cache counters"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.nbytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'coalesced': self.coalesced,
+            }
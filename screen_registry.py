@@ -0,0 +1,53 @@
+"""Names of the screens and drawing backends, importable without loading either.
+
+Listing what can be rendered costs nothing here; wireframes.py and each
+backend module are only imported once something is actually built.
+"""
+import importlib
+
+# Every screen builder, in the order the journey presents them
+SCREENS = (
+    'create_welcome_screen',
+    'create_user_discovery_screen',
+    'create_playlist_screen',
+    'create_engagement_screen',
+    'create_events_screen',
+    'create_premium_features_screen',
+    'create_exclusive_content_screen',
+    'create_user_content_screen',
+    'create_user_favorites_screen',
+    'create_user_analytics_screen',
+    'create_user_profile_screen',
+    'create_user_profile_screenb',
+    'create_user_preferences_screen'
+)
+
+# Screens whose list accepts item_count and scroll_offset
+LIST_SCREENS = (
+    'create_user_discovery_screen',
+    'create_playlist_screen',
+    'create_engagement_screen',
+    'create_events_screen',
+    'create_user_content_screen',
+    'create_user_favorites_screen',
+    'create_user_analytics_screen',
+    'create_user_profile_screenb'
+)
+
+# Module providing the Drawing class of each backend; all expose the same surface
+BACKENDS = {
+    'svgwrite': 'svgwrite_backend',
+    'fast': 'fast_svg',
+    'columnar': 'columnar_svg'
+}
+
+
+def drawing_class(backend):
+    """The Drawing class of a backend, importing its module on first use"""
+    return importlib.import_module(BACKENDS[backend]).Drawing
+
+
+def screen_names():
+    """Every name UserAppWireframes.render accepts, spec screens included"""
+    from screen_specs import PLANS
+    return SCREENS + tuple(name for name in PLANS if name not in SCREENS)
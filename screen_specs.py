@@ -0,0 +1,338 @@
+"""Screens described as data and compiled into render plans.
+
+A spec is a JSON-compatible dict naming the screen, its nav bar title and
+a list of nodes. Coordinates and sizes may be numbers or expressions over
+width, height, padding, the spec's params and loop variables, e.g.
+'width/2' or '20 + i*(width/3 - 20)'. Text may embed expressions in braces.
+
+    rect       {'rect': [x, y], 'size': [w, h], 'rx': 8, 'fill': 'surface'}
+    circle     {'circle': [cx, cy], 'r': 40, 'fill': 'surface'}
+    text       {'text': 'Activity {i + 1}', 'at': [x, y], 'font': 'body',
+                'fill': 'text', 'anchor': 'middle'}
+    repeat     {'repeat': 'stats', 'as': 'stat', 'index': 'i', 'nodes': [...]}
+    list       {'list': {'top': 368, 'step': 60, 'height': 50},
+                'index': 'i', 'y': 'item_y', 'nodes': [...]}
+    component  {'component': 'list_card', 'at': [x, y], 'width': 'width - 40',
+                'height': 50, ...}
+
+Fills and strokes name a color of the wireframes palette unless they are a
+hex value or CSS keyword. A list node windows its items with item_count and
+scroll_offset params and clips rows cut by its top or bottom, like the
+hand-written list screens.
+
+compile_spec() validates every expression, every name a spec binds and
+every component argument, then generates one straight-line Python function
+per spec, so rendering a spec runs no interpretation of the spec itself.
+register_screen() makes a spec renderable by name.
+"""
+import ast
+import keyword
+import string
+
+from themes import LIGHT
+
+FONTS = {
+    'heading': 'font-family: SF Pro Text; font-size: 17px; font-weight: 600',
+    'subheading': 'font-family: SF Pro Text; font-size: 15px; font-weight: 600',
+    'body': 'font-family: SF Pro Text; font-size: 15px',
+    'caption': 'font-family: SF Pro Text; font-size: 13px',
+    'stat': 'font-family: SF Pro Text; font-size: 17px; font-weight: bold',
+}
+
+CSS_COLORS = {'none', 'white', 'black', 'transparent', 'currentColor'}
+
+# Names every expression may use; params and loop variables are added per spec
+BASE_NAMES = {'width', 'height', 'padding'}
+
+# Names the generated function binds itself, so specs cannot rebind them
+RESERVED_NAMES = BASE_NAMES | {'wf', 'dwg', 'colors'}
+
+# Prefix of the names generated code binds per node, such as a list's items
+GENERATED_PREFIX = '__'
+
+ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Constant, ast.Name, ast.Load,
+    ast.Subscript, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod,
+    ast.USub, ast.UAdd
+)
+
+# Components and the arguments each accepts: the keyword parameters of the
+# matching UserAppWireframes.draw_* method
+COMPONENTS = {
+    'list_card': {'width', 'height', 'outline', 'media', 'avatar', 'action'},
+}
+
+# Component arguments that are expressions; the rest are literal values
+COMPONENT_EXPRESSIONS = {'width', 'height'}
+
+# Literal component arguments limited to the values the draw_* method handles
+COMPONENT_CHOICES = {
+    'action': (None, 'add', 'favorite', 'rsvp', 'select', 'selected', 'checkbox'),
+}
+
+
+class SpecError(ValueError):
+    """A screen spec is malformed or uses a disallowed expression"""
+
+
+class RenderPlan:
+    """A compiled screen spec, ready to draw onto a wireframes drawing"""
+
+    def __init__(self, spec, function, source):
+        self.name = spec['name']
+        self.title = spec['title']
+        self.show_back = spec.get('show_back', True)
+        self.params = dict(spec.get('params', {}))
+        self.function = function
+        self.source = source
+
+    def run(self, wireframes, **params):
+        """Build the screen with wireframes' palette and dimensions"""
+        dwg = wireframes.create_base_screen(self.name)
+        wireframes.add_nav_bar(dwg, self.title, show_back=self.show_back)
+        self.function(
+            wireframes, dwg,
+            wireframes.screen_width, wireframes.screen_height, wireframes.padding,
+            wireframes.colors, **params
+        )
+        return dwg
+
+
+def check_expression(expression, names):
+    """Source of a validated expression over the given names"""
+    if isinstance(expression, (int, float)) and not isinstance(expression, bool):
+        return repr(expression)
+    if not isinstance(expression, str):
+        raise SpecError(f"expected a number or expression, got {expression!r}")
+    try:
+        tree = ast.parse(expression, mode='eval')
+    except SyntaxError as exc:
+        raise SpecError(f"invalid expression {expression!r}: {exc.msg}") from None
+    for node in ast.walk(tree):
+        if not isinstance(node, ALLOWED_NODES):
+            raise SpecError(f"{type(node).__name__} is not allowed in {expression!r}")
+        if isinstance(node, ast.Name) and node.id not in names:
+            raise SpecError(f"unknown name {node.id!r} in {expression!r}")
+    return f'({expression})'
+
+
+def check_name(name, kind):
+    """A name the spec binds (param or loop variable), if it is safe to emit"""
+    if (
+        not isinstance(name, str) or not name.isidentifier()
+        or keyword.iskeyword(name) or name in RESERVED_NAMES
+        or name.startswith(GENERATED_PREFIX)
+    ):
+        raise SpecError(f"invalid {kind} name {name!r}")
+    return name
+
+
+def text_source(text, names):
+    """Python source producing a text node's string"""
+    if not isinstance(text, str):
+        raise SpecError(f"expected text, got {text!r}")
+    parts = []
+    for literal, field, spec, conversion in string.Formatter().parse(text):
+        if literal:
+            parts.append(repr(literal))
+        if field is not None:
+            if spec or conversion:
+                raise SpecError(f"format specs are not supported in {text!r}")
+            parts.append(f'str({check_expression(field, names)})')
+    return ' + '.join(parts) if parts else "''"
+
+
+def color_source(value):
+    if not isinstance(value, str):
+        raise SpecError(f"expected a color name or value, got {value!r}")
+    if value.startswith('#') or value in CSS_COLORS:
+        return repr(value)
+    if value not in LIGHT:
+        raise SpecError(f"unknown color {value!r}, expected one of {sorted(LIGHT)}")
+    return f'colors[{value!r}]'
+
+
+def point_source(point, names):
+    if not isinstance(point, (list, tuple)) or len(point) != 2:
+        raise SpecError(f"expected an [x, y] pair, got {point!r}")
+    x, y = point
+    return f'({check_expression(x, names)}, {check_expression(y, names)})'
+
+
+def paint_source(node):
+    """Keyword arguments for fill, stroke and rounding shared by shapes"""
+    args = []
+    if 'rx' in node:
+        args.append(f"rx={node['rx']!r}, ry={node.get('ry', node['rx'])!r}")
+    for key in ('fill', 'stroke'):
+        if key in node:
+            args.append(f'{key}={color_source(node[key])}')
+    if 'stroke_width' in node:
+        args.append(f"stroke_width={node['stroke_width']!r}")
+    return ''.join(f', {arg}' for arg in args)
+
+
+def compile_nodes(nodes, names, lines, indent, parent='dwg'):
+    """Append the source drawing nodes to lines, adding elements to parent"""
+    pad = '    ' * indent
+    for node in nodes:
+        if 'rect' in node:
+            lines.append(
+                f"{pad}{parent}.add(dwg.rect({point_source(node['rect'], names)}, "
+                f"{point_source(node['size'], names)}{paint_source(node)}))"
+            )
+        elif 'circle' in node:
+            lines.append(
+                f"{pad}{parent}.add(dwg.circle({point_source(node['circle'], names)}, "
+                f"{check_expression(node['r'], names)}{paint_source(node)}))"
+            )
+        elif 'text' in node:
+            args = [text_source(node['text'], names), f"insert={point_source(node['at'], names)}"]
+            if 'anchor' in node:
+                args.append(f"text_anchor={node['anchor']!r}")
+            args.append(f"fill={color_source(node.get('fill', 'text'))}")
+            font = node.get('font', 'body')
+            if font not in FONTS:
+                raise SpecError(f"unknown font {font!r}")
+            style = node.get('style') or FONTS[font]
+            args.append(f'style={style!r}')
+            lines.append(f"{pad}{parent}.add(dwg.text({', '.join(args)}))")
+        elif 'component' in node:
+            component = node['component']
+            if component not in COMPONENTS:
+                raise SpecError(f"unknown component {component!r}")
+            args = [repr(component), point_source(node['at'], names)]
+            if parent != 'dwg':
+                args.append(f'parent={parent}')
+            for key, value in node.items():
+                if key in ('component', 'at'):
+                    continue
+                if key not in COMPONENTS[component]:
+                    raise SpecError(f"unknown {component} argument {key!r}")
+                if key in COMPONENT_CHOICES and value not in COMPONENT_CHOICES[key]:
+                    raise SpecError(f"unknown {component} {key} {value!r}")
+                if key in COMPONENT_EXPRESSIONS:
+                    args.append(f'{key}={check_expression(value, names)}')
+                else:
+                    args.append(f'{key}={tuple(value) if isinstance(value, list) else value!r}')
+            lines.append(f"{pad}wf.add_component(dwg, {', '.join(args)})")
+        elif 'repeat' in node:
+            index = check_name(node.get('index', '_'), 'index')
+            item = check_name(node['as'], 'loop variable')
+            items = node['repeat']
+            source = check_expression(items, names) if isinstance(items, str) else repr(items)
+            lines.append(f'{pad}for {index}, {item} in enumerate({source}):')
+            compile_nodes(node['nodes'], names | {index, item}, lines, indent + 1, parent)
+        elif 'list' in node:
+            window = node['list']
+            index = check_name(node.get('index', '_'), 'index')
+            y = check_name(node.get('y', 'item_y'), 'loop variable')
+            args = [
+                check_expression(window['top'], names),
+                check_expression(window['step'], names),
+                check_expression(window['height'], names),
+                'item_count', 'scroll_offset'
+            ]
+            if 'bottom' in window:
+                args.append(f"bottom={check_expression(window['bottom'], names)}")
+            if parent != 'dwg':
+                args.append(f'parent={parent}')
+            items = f'{GENERATED_PREFIX}items{indent}'
+            lines.append(f"{pad}with wf.list_viewport(dwg, {', '.join(args)}) as ({items}, {GENERATED_PREFIX}window{indent}):")
+            lines.append(f"{pad}    for {index}, {y} in {GENERATED_PREFIX}window{indent}:")
+            compile_nodes(node['nodes'], names | {index, y}, lines, indent + 2, items)
+        else:
+            raise SpecError(f"unknown node {node!r}")
+
+
+def compile_spec(spec):
+    """Compile a screen spec into a RenderPlan"""
+    for key in ('name', 'title', 'nodes'):
+        if key not in spec:
+            raise SpecError(f"screen spec is missing {key!r}")
+    params = dict(spec.get('params', {}))
+    if any('list' in node for node in walk(spec['nodes'])):
+        params.setdefault('item_count', 0)
+        params.setdefault('scroll_offset', 0)
+    for name in params:
+        check_name(name, 'param')
+
+    signature = ''.join(f', {name}={value!r}' for name, value in params.items())
+    lines = [f'def plan(wf, dwg, width, height, padding, colors{signature}):']
+    compile_nodes(spec['nodes'], BASE_NAMES | set(params), lines, 1)
+    lines.append('    return dwg')
+    source = '\n'.join(lines) + '\n'
+
+    namespace = {}
+    exec(compile(source, f"<screen spec {spec['name']}>", 'exec'), namespace)
+    spec = dict(spec, params=params)
+    return RenderPlan(spec, namespace['plan'], source)
+
+
+def walk(nodes):
+    for node in nodes:
+        yield node
+        yield from walk(node.get('nodes', ()))
+
+
+# Registered plans by screen name
+PLANS = {}
+
+
+def register_screen(spec):
+    """Compile a spec and make it renderable by its name"""
+    plan = compile_spec(spec)
+    PLANS[plan.name] = plan
+    return plan
+
+
+def profile_header(stats):
+    """Avatar, username and stat tiles shared by the profile screens"""
+    return [
+        {'circle': ['width/2', 158], 'r': 40, 'fill': 'surface'},
+        {'text': 'Username', 'at': ['width/2', 218], 'anchor': 'middle', 'font': 'heading'},
+        {'repeat': stats, 'as': 'stat', 'index': 'i', 'nodes': [
+            {'rect': ['20 + i*(width/3 - 20)', 248], 'size': ['width/3 - 30', 60],
+             'rx': 8, 'fill': 'surface'},
+            {'text': "{stat['value']}", 'at': ["20 + i*(width/3 - 20) + (width/3 - 30)/2", 273],
+             'anchor': 'middle', 'font': 'stat'},
+            {'text': "{stat['label']}", 'at': ["20 + i*(width/3 - 20) + (width/3 - 30)/2", 293],
+             'anchor': 'middle', 'fill': 'secondary', 'font': 'caption'},
+        ]},
+    ]
+
+
+USER_PROFILE = {
+    'name': 'user_profile',
+    'title': 'Profile',
+    'nodes': profile_header([
+        {'label': 'Playlists', 'value': '12'},
+        {'label': 'Following', 'value': '45'},
+        {'label': 'Events', 'value': '3'}
+    ]) + [
+        # Settings button
+        {'rect': [20, 'height - 80'], 'size': ['width - 40', 50], 'rx': 25, 'fill': 'primary'},
+        {'text': 'Edit Profile', 'at': ['width/2', 'height - 45'], 'anchor': 'middle',
+         'fill': 'white', 'font': 'heading'},
+    ]
+}
+
+USER_PROFILE_ACTIVITY = {
+    'name': 'user_profile_activity',
+    'title': 'Profile',
+    'params': {'item_count': 3, 'scroll_offset': 0},
+    'nodes': profile_header([
+        {'label': 'Following', 'value': '45'},
+        {'label': 'Playlists', 'value': '12'},
+        {'label': 'Events', 'value': '3'}
+    ]) + [
+        {'text': 'Recent Activity', 'at': [20, 348], 'font': 'subheading'},
+        {'list': {'top': 368, 'step': 60, 'height': 50}, 'index': 'i', 'y': 'item_y', 'nodes': [
+            {'component': 'list_card', 'at': [20, 'item_y'], 'width': 'width - 40', 'height': 50},
+            {'text': 'Activity {i + 1}', 'at': [40, 'item_y + 30']},
+        ]},
+    ]
+}
+
+for spec in (USER_PROFILE, USER_PROFILE_ACTIVITY):
+    register_screen(spec)
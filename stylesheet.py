@@ -0,0 +1,70 @@
+"""Move repeated presentation attributes into CSS classes.
+
+Every inline SVG on a page shares one CSS namespace, so class names are
+derived from the rule they stand for: the same name always means the same
+declarations, whichever screen emitted it.
+"""
+import zlib
+from xml.etree import ElementTree as etree
+
+# Presentation attributes folded into classes, in declaration order; the
+# inline style goes last so it keeps overriding the attributes
+STYLED_ATTRIBUTES = ('fill', 'stroke', 'stroke-width', 'text-anchor', 'style')
+
+
+class StyleSheet:
+    """Collects distinct style combinations and names each one once"""
+
+    def __init__(self):
+        self.rules = {}
+
+    def __len__(self):
+        return len(self.rules)
+
+    def classify(self, attribs):
+        """Replace the styling in attribs with a class, returning its name"""
+        declarations = []
+        for name in STYLED_ATTRIBUTES:
+            value = attribs.pop(name, None)
+            if value is None or value == '':
+                continue
+            if name == 'style':
+                for declaration in str(value).split(';'):
+                    prop, _, prop_value = declaration.partition(':')
+                    if prop.strip():
+                        declarations.append(f'{prop.strip()}:{prop_value.strip()}')
+            else:
+                declarations.append(f'{name}:{value}')
+        if not declarations:
+            return None
+        rule = ';'.join(declarations)
+        class_name = self.rules.get(rule)
+        if class_name is None:
+            class_name = self.rules[rule] = f's{zlib.crc32(rule.encode()):08x}'
+        attribs['class'] = class_name
+        return class_name
+
+    def css(self):
+        """Serialize the collected rules, ordered by class name"""
+        return ''.join(
+            f'.{class_name}{{{rule}}}'
+            for rule, class_name in sorted(self.rules.items(), key=lambda item: item[1])
+        )
+
+    def apply_to_xml(self, root):
+        """Classify every element of an ElementTree and embed the stylesheet"""
+        for node in root.iter():
+            if node is root or not node.attrib:
+                continue
+            attribs = dict(node.attrib)
+            if self.classify(attribs):
+                node.attrib.clear()
+                node.attrib.update(sorted(attribs.items()))
+        if self.rules:
+            defs = root.find('defs')
+            if defs is None:
+                defs = etree.Element('defs')
+                root.insert(0, defs)
+            style = etree.Element('style')
+            style.text = self.css()
+            defs.insert(0, style)
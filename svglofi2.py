@@ -1,1157 +1,256 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+
 import streamlit as st
-import svgwrite
 
-class UserAppWireframes:
-    def __init__(self):
-        self.screen_width = 360
-        self.screen_height = 640
-        self.padding = 20
-        self.colors = {
-            'background': '#FFFFFF',
-            'text': '#000000',
-            'primary': '#007AFF',
-            'secondary': '#666666',
-            'border': '#C5C5C7',
-            'surface': '#F5F5F5'
-        }
+from bundle_cache import BundleCache
+from hit_test import inspect_screen
+from journey import (
+    FLOW_DESCRIPTION, NEXT_SCREENS, SCREEN_SECTIONS, SECTION_NAMES, SECTIONS, next_screens
+)
+from prefetch import Prefetcher
+from render_cache import RenderCache
+from screen_registry import LIST_SCREENS
+from themes import PALETTES, palette_css
 
-    def create_base_screen(self, name):
-        """Create base screen with iPhone frame"""
-        dwg = svgwrite.Drawing(size=(self.screen_width, self.screen_height))
-        
-        # Phone frame
-        dwg.add(dwg.rect(
-            (0, 0),
-            (self.screen_width, self.screen_height),
-            rx=40, ry=40,
-            fill=self.colors['background'],
-            stroke=self.colors['border'],
-            stroke_width=2
-        ))
-        
-        # Status bar
-        dwg.add(dwg.rect(
-            (0, 0),
-            (self.screen_width, 44),
-            fill=self.colors['surface']
-        ))
-        
-        # Notch
-        dwg.add(dwg.rect(
-            (self.screen_width/2 - 60, 0),
-            (120, 30),
-            rx=15, ry=15,
-            fill='#333333'
-        ))
-        
-        return dwg
+ALL_FLOWS = "All flows"
 
-    def add_nav_bar(self, dwg, title, show_back=True):
-        """Add navigation bar to screen"""
-        # Nav bar background
-        dwg.add(dwg.rect(
-            (0, 44),
-            (self.screen_width, 44),
-            fill=self.colors['background']
-        ))
-        
-        # Back button if needed
-        if show_back:
-            dwg.add(dwg.path(
-                d=f'M 20,66 L 35,58 L 35,74 Z',
-                fill=self.colors['primary']
-            ))
-        
-        # Title
-        dwg.add(dwg.text(
-            title,
-            insert=(self.screen_width/2, 74),
-            text_anchor='middle',
-            fill=self.colors['text'],
-            style='font-family: SF Pro Text; font-size: 17px; font-weight: 600'
-        ))
+@st.cache_resource
+def get_wireframes():
+    """The wireframe builder, shared by every session"""
+    # Screen code and its backend load on first render, not at app import
+    from wireframes import UserAppWireframes
+    # Colors are CSS variables, so every theme shares the same renders
+    return UserAppWireframes(backend='fast', symbols=True, stylesheet=True, cull=True, css_vars=True)
 
-    def create_welcome_screen(self):
-        """Create user welcome screen"""
-        dwg = self.create_base_screen("welcome")
-        self.add_nav_bar(dwg, "Welcome", show_back=False)
-        
-        # App logo
-        dwg.add(dwg.circle(
-            (self.screen_width/2, 180),
-            50,
-            fill=self.colors['primary']
-        ))
-        
-        # Welcome text
-        dwg.add(dwg.text(
-            "Welcome to Ball Talk",
-            insert=(self.screen_width/2, 280),
-            text_anchor='middle',
-            fill=self.colors['text'],
-            style='font-family: SF Pro Text; font-size: 24px; font-weight: 600'
-        ))
-        
-        # Description
-        dwg.add(dwg.text(
-            "Connect with your favorite athletes",
-            insert=(self.screen_width/2, 320),
-            text_anchor='middle',
-            fill=self.colors['secondary'],
-            style='font-family: SF Pro Text; font-size: 16px'
-        ))
-        
-        # Sign up buttons
-        y = self.screen_height - 200
-        buttons = [
-            {'text': 'Continue with Email', 'primary': True},
-            {'text': 'Continue with Social', 'primary': False}
-        ]
-        
-        for button in buttons:
-            dwg.add(dwg.rect(
-                (20, y),
-                (self.screen_width - 40, 50),
-                rx=25, ry=25,
-                fill=self.colors['primary'] if button['primary'] else 'none',
-                stroke=self.colors['primary']
-            ))
-            dwg.add(dwg.text(
-                button['text'],
-                insert=(self.screen_width/2, y + 32),
-                text_anchor='middle',
-                fill='white' if button['primary'] else self.colors['primary'],
-                style='font-family: SF Pro Text; font-size: 17px; font-weight: 600'
-            ))
-            y += 70
-        
-        return dwg
-    def create_user_discovery_screen(self):
-        """Create user discovery screen wireframe"""
-        dwg = self.create_base_screen("discovery")
-        self.add_nav_bar(dwg, "Discover")
-        
-        # Search bar
-        y = 108
-        dwg.add(dwg.rect(
-            (20, y),
-            (self.screen_width - 40, 44),
-            rx=22, ry=22,
-            fill=self.colors['surface']
-        ))
-        dwg.add(dwg.text(
-            "Search athletes, leagues...",
-            insert=(50, y + 28),
-            fill=self.colors['secondary'],
-            style='font-family: SF Pro Text; font-size: 15px'
-        ))
-        
-    # Filter chips
-        y += 64
-        filters = ['All', 'NBA', 'NFL', 'MLB']
-        x = 20
-        for filter_text in filters:
-            width = len(filter_text) * 10 + 30
-            dwg.add(dwg.rect(
-                (x, y),
-                (width, 32),
-                rx=16, ry=16,
-                fill=self.colors['surface'] if filter_text == 'All' else 'none',
-                stroke=self.colors['border']
-            ))
-            dwg.add(dwg.text(
-                filter_text,
-                insert=(x + width/2, y + 20),
-                text_anchor='middle',
-                fill=self.colors['primary'] if filter_text == 'All' else self.colors['text'],
-                style='font-family: SF Pro Text; font-size: 13px'
-            ))
-            x += width + 10
-    
-    # Featured Athletes
-        y += 60
-        dwg.add(dwg.text(
-            "Featured Athletes",
-            insert=(20, y),
-            fill=self.colors['text'],
-            style='font-family: SF Pro Text; font-size: 17px; font-weight: 600'
-        ))
-    
-    # Artist grid
-        y += 20
-        for i in range(4):
-            dwg.add(dwg.rect(
-                (20, y + i*120),
-                (self.screen_width - 40, 100),
-                rx=8, ry=8,
-                fill=self.colors['surface']
-            ))
-            # Artist avatar
-            dwg.add(dwg.circle(
-                (60, y + i*120 + 50),
-                30,
-                fill='#E5E5EA'
-            ))
-            # Artist info
-            dwg.add(dwg.text(
-                f"Athlete Name",
-                insert=(100, y + i*120 + 40),
-                fill=self.colors['text'],
-                style='font-family: SF Pro Text; font-size: 15px; font-weight: 600'
-            ))
-            dwg.add(dwg.text(
-                "NBA • Detroit Pistons",
-                insert=(100, y + i*120 + 60),
-                fill=self.colors['secondary'],
-                style='font-family: SF Pro Text; font-size: 13px'
-            ))
-        return dwg
+@st.cache_resource
+def get_render_cache():
+    """Rendered screens shared by every session of the server process
 
-    def create_playlist_screen(self):
-        """Create playlist creation screen"""
-        dwg = self.create_base_screen("playlist")
-        self.add_nav_bar(dwg, "Create Playlist")
-        
-        # Playlist name input
-        y = 108
-        dwg.add(dwg.text(
-            "Playlist Name",
-            insert=(20, y),
-            fill=self.colors['text'],
-            style='font-family: SF Pro Text; font-size: 15px'
-        ))
-        dwg.add(dwg.rect(
-            (20, y + 10),
-            (self.screen_width - 40, 44),
-            rx=8, ry=8,
-            fill='none',
-            stroke=self.colors['border']
-        ))
-        
-        # Track selection
-        y += 84
-        dwg.add(dwg.text(
-            "Add Tracks",
-            insert=(20, y),
-            fill=self.colors['text'],
-            style='font-family: SF Pro Text; font-size: 15px'
-        ))
-        
-        # Track list
-        for i in range(5):
-            dwg.add(dwg.rect(
-                (20, y + 20 + i*60),
-                (self.screen_width - 40, 50),
-                rx=8, ry=8,
-                fill=self.colors['surface']
-            ))
-            # Track info
-            dwg.add(dwg.text(
-                f"Track {i+1}",
-                insert=(40, y + 45 + i*60),
-                fill=self.colors['text'],
-                style='font-family: SF Pro Text; font-size: 15px'
-            ))
-            # Add button
-            dwg.add(dwg.circle(
-                (self.screen_width - 45, y + 45 + i*60),
-                15,
-                fill=self.colors['primary']
-            ))
-            dwg.add(dwg.text(
-                "+",
-                insert=(self.screen_width - 45, y + 50 + i*60),
-                text_anchor='middle',
-                fill='white',
-                style='font-family: SF Pro Text; font-size: 20px'
-            ))
-        
-        # Create button
-        dwg.add(dwg.rect(
-            (20, self.screen_height - 80),
-            (self.screen_width - 40, 50),
-            rx=25, ry=25,
-            fill=self.colors['primary']
-        ))
-        dwg.add(dwg.text(
-            "Create Playlist",
-            insert=(self.screen_width/2, self.screen_height - 45),
-            text_anchor='middle',
-            fill='white',
-            style='font-family: SF Pro Text; font-size: 17px; font-weight: 600'
-        ))
-        
-        return dwg
-    def create_engagement_screen(self):
-        """Create user engagement screen wireframe"""
-        dwg = self.create_base_screen("engagement")
-        self.add_nav_bar(dwg, "Community")
-        
-        # Tab bar
-        y = 88
-        tabs = ['Feed', 'Events', 'Messages']
-        tab_width = self.screen_width / len(tabs)
-        for i, tab in enumerate(tabs):
-            # Tab background
-            dwg.add(dwg.rect(
-                (i * tab_width, y),
-                (tab_width, 44),
-                fill=self.colors['surface'] if i == 0 else 'none',
-                stroke=self.colors['border']
-            ))
-            # Tab text
-            dwg.add(dwg.text(
-                tab,
-                insert=(i * tab_width + tab_width/2, y + 28),
-                text_anchor='middle',
-                fill=self.colors['primary'] if i == 0 else self.colors['secondary'],
-                style='font-family: SF Pro Text; font-size: 15px'
-            ))
-        
-        # Community Feed
-        y = 152
-        dwg.add(dwg.text(
-            "Community Feed",
-            insert=(20, y),
-            fill=self.colors['text'],
-            style='font-family: SF Pro Text; font-size: 17px; font-weight: 600'
-        ))
-        
-        # Feed items
-        y += 20
-        for i in range(3):
-            dwg.add(dwg.rect(
-                (20, y + i*120),
-                (self.screen_width - 40, 100),
-                rx=8, ry=8,
-                fill=self.colors['surface']
-            ))
-            # User avatar
-            dwg.add(dwg.circle(
-                (50, y + i*120 + 30),
-                20,
-                fill='#E5E5EA'
-            ))
-            # Post content
-            dwg.add(dwg.text(
-                "Athlete Name",
-                insert=(80, y + i*120 + 25),
-                fill=self.colors['text'],
-                style='font-family: SF Pro Text; font-size: 15px; font-weight: 600'
-            ))
-            dwg.add(dwg.text(
-                "Post preview...",
-                insert=(80, y + i*120 + 45),
-                fill=self.colors['secondary'],
-                style='font-family: SF Pro Text; font-size: 13px'
-            ))
-        
-        return dwg
+    Cache keys cover every setting and parameter that changes the output,
+    so one session's render is valid for all. Concurrent sessions missing
+    the same screen wait for a single render of it.
+    """
+    directory = os.environ.get('WIREFRAME_CACHE_DIR', '.wireframe_cache')
+    # Renders persist across restarts unless WIREFRAME_CACHE_DIR is empty
+    store = BundleCache(os.path.join(directory, 'renders.bundle')) if directory else None
+    return RenderCache(maxsize=256, max_bytes=32 * 1024 * 1024, store=store)
 
-    def create_events_screen(self):
-        """Create events screen wireframe"""
-        dwg = self.create_base_screen("events")
-        self.add_nav_bar(dwg, "Events")
-        
-        # Search bar
-        y = 108
-        dwg.add(dwg.rect(
-            (20, y),
-            (self.screen_width - 40, 44),
-            rx=22, ry=22,
-            fill=self.colors['surface']
-        ))
-        dwg.add(dwg.text(
-            "Search events...",
-            insert=(50, y + 28),
-            fill=self.colors['secondary'],
-            style='font-family: SF Pro Text; font-size: 15px'
-        ))
-        
-        # Upcoming Events
-        y += 64
-        dwg.add(dwg.text(
-            "Upcoming Events",
-            insert=(20, y),
-            fill=self.colors['text'],
-            style='font-family: SF Pro Text; font-size: 17px; font-weight: 600'
-        ))
-        
-        # Event cards
-        y += 20
-        for i in range(3):
-            dwg.add(dwg.rect(
-                (20, y + i*140),
-                (self.screen_width - 40, 120),
-                rx=8, ry=8,
-                fill=self.colors['surface']
-            ))
-            # Event image placeholder
-            dwg.add(dwg.rect(
-                (20, y + i*140),
-                (self.screen_width - 40, 60),
-                rx=8, ry=8,
-                fill='#E5E5EA'
-            ))
-            # Event details
-            dwg.add(dwg.text(
-                f"Event {i+1}",
-                insert=(30, y + i*140 + 80),
-                fill=self.colors['text'],
-                style='font-family: SF Pro Text; font-size: 15px; font-weight: 600'
-            ))
-            dwg.add(dwg.text(
-                "Date & Location",
-                insert=(30, y + i*140 + 100),
-                fill=self.colors['secondary'],
-                style='font-family: SF Pro Text; font-size: 13px'
-            ))
-            # RSVP button
-            dwg.add(dwg.rect(
-                (self.screen_width - 100, y + i*140 + 75),
-                (60, 30),
-                rx=15, ry=15,
-                fill=self.colors['primary']
-            ))
-            dwg.add(dwg.text(
-                "RSVP",
-                insert=(self.screen_width - 70, y + i*140 + 95),
-                text_anchor='middle',
-                fill='white',
-                style='font-family: SF Pro Text; font-size: 13px'
-            ))
-        
-        return dwg
-    def create_premium_features_screen(self):
-        """Create premium features screen wireframe"""
-        dwg = self.create_base_screen("premium_features")
-        self.add_nav_bar(dwg, "Premium Features")
-        
-        # Plans section
-        y = 108
-        dwg.add(dwg.text(
-            "Premium Plans",
-            insert=(20, y),
-            fill=self.colors['text'],
-            style='font-family: -apple-system, SF Pro Text, Helvetica; font-size: 17px; font-weight: 600'
-        ))
-        
-        # Subscription plans with proper spacing and content
-        plans = [
-            {
-                'name': 'Basic',
-                'price': '$0',
-                'features': 'Previews + Limited access',
-                'selected': False
-            },
-            {
-                'name': 'Plus',
-                'price': '$6.99',
-                'features': 'Basic streaming access',
-                'selected': False
-            },
-            {
-                'name': 'Pro',
-                'price': '$9.99',
-                'features': 'Unlimited streaming + Downloads',
-                'selected': True
-            },
-            {
-                'name': 'Elite',
-                'price': '$17.99',
-                'features': 'All features + VIP access',
-                'selected': False
-            }
-        ]
-        
-        y += 30
-        for i, plan in enumerate(plans):
-            # Plan container with proper spacing
-            dwg.add(dwg.rect(
-                (20, y),
-                (self.screen_width - 40, 120),
-                rx=8, ry=8,
-                fill=self.colors['surface']
-            ))
-            
-            # Plan name
-            dwg.add(dwg.text(
-                plan['name'],
-                insert=(40, y + 30),
-                fill=self.colors['text'],
-                style='font-family: -apple-system, SF Pro Text, Helvetica; font-size: 17px; font-weight: 600'
-            ))
-            
-            # Price with currency symbol
-            dwg.add(dwg.text(
-                plan['price'],
-                insert=(40, y + 60),
-                fill=self.colors['primary'],
-                style='font-family: -apple-system, SF Pro Text, Helvetica; font-size: 24px; font-weight: bold'
-            ))
-            
-            # Features text
-            dwg.add(dwg.text(
-                plan['features'],
-                insert=(40, y + 90),
-                fill=self.colors['secondary'],
-                style='font-family: -apple-system, SF Pro Text, Helvetica; font-size: 13px'
-            ))
-            
-            # Select button
-            dwg.add(dwg.rect(
-                (self.screen_width - 100, y + 45),  # Adjusted y position
-                (60, 30),
-                rx=15, ry=15,
-                fill=self.colors['primary'] if plan['selected'] else 'none',
-                stroke=self.colors['primary']
-            ))
-            
-            dwg.add(dwg.text(
-                "Select",
-                insert=(self.screen_width - 70, y + 65),  # Adjusted y position
-                text_anchor='middle',
-                fill='white' if plan['selected'] else self.colors['primary'],
-                style='font-family: -apple-system, SF Pro Text, Helvetica; font-size: 13px'
-            ))
-            
-            y += 100  # Increased spacing between plans
-        
-        return dwg
+@st.cache_resource
+def get_prefetcher():
+    """One background prefetch pool for the whole server process"""
+    return Prefetcher()
+
+@st.cache_resource
+def get_render_pool():
+    """Worker threads shared by every session for progressive rendering"""
+    return ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1), thread_name_prefix='render')
+
+def screen_params(screen, list_params=None):
+    """Builder params for screen: the stress-mode list sizes for list screens"""
+    return list_params if list_params and screen in LIST_SCREENS else {}
+
+def go_to(screen):
+    """Button callback: switch the page to the section showing screen"""
+    st.session_state['flow'] = SCREEN_SECTIONS[screen]
+
+def prefetch_next(wireframes, cache, screens, list_params=None):
+    """Render the sections one navigation step away into the cache"""
+    prefetcher = get_prefetcher()
+    sections = {SCREEN_SECTIONS[screen] for screen in next_screens(screens)}
+    for name, section_screens in SECTIONS:
+        if name not in sections:
+            continue
+        for _, screen, _ in section_screens:
+            prefetcher.prefetch(wireframes, cache, screen, **screen_params(screen, list_params))
+
+def format_ms(value):
+    return "-" if value is None else f"{value:.2f} ms"
+
+def show_screen(wireframes, cache, screen, profile=None, list_params=None):
+    """Embed one screen; with a profile list, also report what it cost"""
+    params = screen_params(screen, list_params)
+    if profile is None:
+        st.markdown(wireframes.render(screen, cache, **params), unsafe_allow_html=True)
+        return
 
-    def create_exclusive_content_screen(self):
-        """Create exclusive content screen wireframe"""
-        dwg = self.create_base_screen("exclusive_content")
-        self.add_nav_bar(dwg, "Exclusive Content")
-        
-        # VIP Events section
-        y = 108
-        dwg.add(dwg.text(
-            "VIP Events",
-            insert=(20, y),
-            fill=self.colors['text'],
-            style='font-family: SF Pro Text; font-size: 17px; font-weight: 600'
-        ))
-        
-        # Event cards
-        y += 30
-        for i in range(2):
-            dwg.add(dwg.rect(
-                (20, y),
-                (self.screen_width - 40, 120),
-                rx=8, ry=8,
-                fill=self.colors['surface']
-            ))
-            # Event image area
-            dwg.add(dwg.rect(
-                (20, y),
-                (self.screen_width - 40, 60),
-                rx=8, ry=8,
-                fill='#E5E5EA'
-            ))
-            # Event details
-            dwg.add(dwg.text(
-                f"VIP Event {i+1}",
-                insert=(40, y + 80),
-                fill=self.colors['text'],
-                style='font-family: SF Pro Text; font-size: 15px; font-weight: 600'
-            ))
-            dwg.add(dwg.text(
-                "Exclusive Meet & Greet",
-                insert=(40, y + 100),
-                fill=self.colors['secondary'],
-                style='font-family: SF Pro Text; font-size: 13px'
-            ))
-            y += 140
-        
-        # Premium Content section
-        dwg.add(dwg.text(
-            "Premium Content",
-            insert=(20, y),
-            fill=self.colors['text'],
-            style='font-family: SF Pro Text; font-size: 17px; font-weight: 600'
-        ))
-        
-        # Content grid
-        y += 30
-        for i in range(2):
-            dwg.add(dwg.rect(
-                (20, y),
-                (self.screen_width - 40, 80),
-                rx=8, ry=8,
-                fill=self.colors['surface']
-            ))
-            # Content info
-            dwg.add(dwg.text(
-                f"Exclusive Track {i+1}",
-                insert=(40, y + 30),
-                fill=self.colors['text'],
-                style='font-family: SF Pro Text; font-size: 15px; font-weight: 600'
-            ))
-            dwg.add(dwg.text(
-                "Premium Release",
-                insert=(40, y + 50),
-                fill=self.colors['secondary'],
-                style='font-family: SF Pro Text; font-size: 13px'
-            ))
-            y += 100
-        
-        return dwg
+    caption = st.empty()
+    stats = {'screen': screen}
+    svg = wireframes.render(screen, cache, stats, **params)
+    embed_screen(st, svg, stats, caption, profile)
 
-    def create_user_content_screen(self):
-        """Create user content management screen wireframe"""
-        dwg = self.create_base_screen("user_content")
-        self.add_nav_bar(dwg, "My Library")
-        
-        # Search and filter
-        y = 108
-        dwg.add(dwg.rect(
-            (20, y),
-            (self.screen_width - 40, 44),
-            rx=22, ry=22,
-            fill=self.colors['surface']
-        ))
-        dwg.add(dwg.text(
-            "Search playlists...",
-            insert=(50, y + 28),
-            fill=self.colors['secondary'],
-            style='font-family: SF Pro Text; font-size: 15px'
-        ))
-        
-        # Playlists section
-        y += 74
-        dwg.add(dwg.text(
-            "My Playlists",
-            insert=(20, y),
-            fill=self.colors['text'],
-            style='font-family: SF Pro Text; font-size: 17px; font-weight: 600'
-        ))
-        
-        # Playlist grid
-        y += 20
-        for i in range(3):
-            dwg.add(dwg.rect(
-                (20, y + i*120),
-                (self.screen_width - 40, 100),
-                rx=8, ry=8,
-                fill=self.colors['surface']
-            ))
-            # Playlist cover
-            dwg.add(dwg.rect(
-                (20, y + i*120),
-                (100, 100),
-                rx=8, ry=8,
-                fill='#E5E5EA'
-            ))
-            # Playlist info
-            dwg.add(dwg.text(
-                f"Playlist {i+1}",
-                insert=(140, y + i*120 + 30),
-                fill=self.colors['text'],
-                style='font-family: SF Pro Text; font-size: 15px; font-weight: 600'
-            ))
-            dwg.add(dwg.text(
-                f"{(i+1)*10} tracks",
-                insert=(140, y + i*120 + 50),
-                fill=self.colors['secondary'],
-                style='font-family: SF Pro Text; font-size: 13px'
-            ))
-            
-        return dwg
+def embed_screen(target, svg, stats, caption, profile):
+    """Embed svg into target, timing it, and report its stats in caption"""
+    start = time.perf_counter()
+    target.markdown(svg, unsafe_allow_html=True)
+    stats['embed_ms'] = (time.perf_counter() - start) * 1000
+    profile.append(stats)
+    parts = [
+        f"build {format_ms(stats['build_ms'])}",
+        f"serialize {format_ms(stats['serialize_ms'])}",
+        f"embed {format_ms(stats['embed_ms'])}"
+    ]
+    if stats['elements'] is not None:
+        parts.append(f"{stats['elements']} elements")
+        parts.append(f"{stats['culled']} culled, {stats['clipped']} clipped")
+    parts.append(f"{stats['bytes']:,} bytes")
+    parts.append(f"cache {stats['cache']}")
+    caption.caption(" · ".join(parts))
 
-    def create_user_favorites_screen(self):
-        """Create user favorites screen wireframe"""
-        dwg = self.create_base_screen("favorites")
-        self.add_nav_bar(dwg, "Favorites")
-        
-        # Tabs
-        y = 88
-        tabs = ['Tracks', 'Artists', 'Playlists']
-        tab_width = self.screen_width / len(tabs)
-        for i, tab in enumerate(tabs):
-            # Tab background
-            dwg.add(dwg.rect(
-                (i * tab_width, y),
-                (tab_width, 44),
-                fill=self.colors['surface'] if i == 0 else 'none',
-                stroke=self.colors['border']
-            ))
-            # Tab text
-            dwg.add(dwg.text(
-                tab,
-                insert=(i * tab_width + tab_width/2, y + 28),
-                text_anchor='middle',
-                fill=self.colors['primary'] if i == 0 else self.colors['secondary'],
-                style='font-family: SF Pro Text; font-size: 15px'
-            ))
-        
-        # Favorites list
-        y = 152
-        for i in range(5):
-            dwg.add(dwg.rect(
-                (20, y + i*70),
-                (self.screen_width - 40, 60),
-                rx=8, ry=8,
-                fill=self.colors['surface']
-            ))
-            # Track/Artist image
-            dwg.add(dwg.rect(
-                (20, y + i*70),
-                (60, 60),
-                rx=8, ry=8,
-                fill='#E5E5EA'
-            ))
-            # Info
-            dwg.add(dwg.text(
-                f"Track {i+1}",
-                insert=(100, y + i*70 + 25),
-                fill=self.colors['text'],
-                style='font-family: SF Pro Text; font-size: 15px; font-weight: 600'
-            ))
-            dwg.add(dwg.text(
-                "Artist Name",
-                insert=(100, y + i*70 + 45),
-                fill=self.colors['secondary'],
-                style='font-family: SF Pro Text; font-size: 13px'
-            ))
-            # Favorite icon
-            dwg.add(dwg.circle(
-                (self.screen_width - 40, y + i*70 + 30),
-                15,
-                fill=self.colors['primary']
-            ))
-        
-        return dwg
-    def create_user_analytics_screen(self):
-        """Create user analytics screen wireframe"""
-        dwg = self.create_base_screen("user_analytics")
-        self.add_nav_bar(dwg, "My Stats")
-        
-        # Listening Stats
-        y = 108
-        dwg.add(dwg.text(
-            "Listening Activity",
-            insert=(20, y),
-            fill=self.colors['text'],
-            style='font-family: SF Pro Text; font-size: 17px; font-weight: 600'
-        ))
-        
-        # Stats cards
-        stats = [
-            {'label': 'Hours Listened', 'value': '24.5'},
-            {'label': 'Artists', 'value': '12'},
-            {'label': 'Playlists', 'value': '5'}
-        ]
-        
-        y += 30
-        for i, stat in enumerate(stats):
-            x = 20 + i*(self.screen_width/3 - 20)
-            dwg.add(dwg.rect(
-                (x, y),
-                ((self.screen_width/3 - 30), 80),
-                rx=8, ry=8,
-                fill=self.colors['surface']
-            ))
-            # Stat value
-            dwg.add(dwg.text(
-                stat['value'],
-                insert=(x + (self.screen_width/3 - 30)/2, y + 35),
-                text_anchor='middle',
-                fill=self.colors['text'],
-                style='font-family: SF Pro Text; font-size: 24px; font-weight: bold'
-            ))
-            # Stat label
-            dwg.add(dwg.text(
-                stat['label'],
-                insert=(x + (self.screen_width/3 - 30)/2, y + 60),
-                text_anchor='middle',
-                fill=self.colors['secondary'],
-                style='font-family: SF Pro Text; font-size: 13px'
-            ))
-        
-        # Top Artists section
-        y += 120
-        dwg.add(dwg.text(
-            "Top Artists",
-            insert=(20, y),
-            fill=self.colors['text'],
-            style='font-family: SF Pro Text; font-size: 15px'
-        ))
-        
-        # Artist list
-        y += 20
-        for i in range(3):
-            dwg.add(dwg.rect(
-                (20, y + i*70),
-                (self.screen_width - 40, 60),
-                rx=8, ry=8,
-                fill=self.colors['surface']
-            ))
-            # Artist image
-            dwg.add(dwg.circle(
-                (50, y + i*70 + 30),
-                25,
-                fill='#E5E5EA'
-            ))
-            # Artist info
-            dwg.add(dwg.text(
-                f"Artist {i+1}",
-                insert=(90, y + i*70 + 25),
-                fill=self.colors['text'],
-                style='font-family: SF Pro Text; font-size: 15px; font-weight: 600'
-            ))
-            dwg.add(dwg.text(
-                f"{(3-i)} hours listened",
-                insert=(90, y + i*70 + 45),
-                fill=self.colors['secondary'],
-                style='font-family: SF Pro Text; font-size: 13px'
-            ))
-        
-        return dwg
+def add_placeholder(slots, profiling, screen):
+    """Reserve the spot of a screen that is rendered later by fill_placeholders"""
+    caption = st.empty() if profiling else None
+    placeholder = st.empty()
+    placeholder.caption("Rendering…")
+    slots.append((screen, placeholder, caption))
 
-    def create_user_profile_screen(self):
-        """Create user profile screen wireframe"""
-        dwg = self.create_base_screen("user_profile")
-        self.add_nav_bar(dwg, "Profile")
-        
-        # Profile header
-        y = 108
-        # Profile image
-        dwg.add(dwg.circle(
-            (self.screen_width/2, y + 50),
-            40,
-            fill=self.colors['surface']
-        ))
-        # Username
-        dwg.add(dwg.text(
-            "Username",
-            insert=(self.screen_width/2, y + 110),
-            text_anchor='middle',
-            fill=self.colors['text'],
-            style='font-family: SF Pro Text; font-size: 17px; font-weight: 600'
-        ))
-        
-        # Stats summary
-        y += 140
-        stats = [
-            {'label': 'Playlists', 'value': '12'},
-            {'label': 'Following', 'value': '45'},
-            {'label': 'Events', 'value': '3'}
-        ]
-        
-        for i, stat in enumerate(stats):
-            x = 20 + i*(self.screen_width/3 - 20)
-            dwg.add(dwg.rect(
-                (x, y),
-                ((self.screen_width/3 - 30), 60),
-                rx=8, ry=8,
-                fill=self.colors['surface']
-            ))
-            dwg.add(dwg.text(
-                stat['value'],
-                insert=(x + (self.screen_width/3 - 30)/2, y + 25),
-                text_anchor='middle',
-                fill=self.colors['text'],
-                style='font-family: SF Pro Text; font-size: 17px; font-weight: bold'
-            ))
-            dwg.add(dwg.text(
-                stat['label'],
-                insert=(x + (self.screen_width/3 - 30)/2, y + 45),
-                text_anchor='middle',
-                fill=self.colors['secondary'],
-                style='font-family: SF Pro Text; font-size: 13px'
-            ))
-        
-        # Settings button
-        dwg.add(dwg.rect(
-            (20, self.screen_height - 80),
-            (self.screen_width - 40, 50),
-            rx=25, ry=25,
-            fill=self.colors['primary']
-        ))
-        dwg.add(dwg.text(
-            "Edit Profile",
-            insert=(self.screen_width/2, self.screen_height - 45),
-            text_anchor='middle',
-            fill='white',
-            style='font-family: SF Pro Text; font-size: 17px; font-weight: 600'
-        ))
-        
-        return dwg
-    def create_user_profile_screenb(self):
-        """Create user profile screen wireframe"""
-        dwg = self.create_base_screen("user_profile")
-        self.add_nav_bar(dwg, "Profile")
-        
-        # Profile header
-        y = 108
-        # Profile image
-        dwg.add(dwg.circle(
-            (self.screen_width/2, y + 50),
-            40,
-            fill=self.colors['surface']
-        ))
-        # Username
-        dwg.add(dwg.text(
-            "Username",
-            insert=(self.screen_width/2, y + 110),
-            text_anchor='middle',
-            fill=self.colors['text'],
-            style='font-family: SF Pro Text; font-size: 17px; font-weight: 600'
-        ))
-        
-        # Stats summary
-        y += 140
-        stats = [
-            {'label': 'Following', 'value': '45'},
-            {'label': 'Playlists', 'value': '12'},
-            {'label': 'Events', 'value': '3'}
-        ]
-        
-        for i, stat in enumerate(stats):
-            x = 20 + i*(self.screen_width/3 - 20)
-            dwg.add(dwg.rect(
-                (x, y),
-                ((self.screen_width/3 - 30), 60),
-                rx=8, ry=8,
-                fill=self.colors['surface']
-            ))
-            dwg.add(dwg.text(
-                stat['value'],
-                insert=(x + (self.screen_width/3 - 30)/2, y + 25),
-                text_anchor='middle',
-                fill=self.colors['text'],
-                style='font-family: SF Pro Text; font-size: 17px; font-weight: bold'
-            ))
-            dwg.add(dwg.text(
-                stat['label'],
-                insert=(x + (self.screen_width/3 - 30)/2, y + 45),
-                text_anchor='middle',
-                fill=self.colors['secondary'],
-                style='font-family: SF Pro Text; font-size: 13px'
-            ))
-        
-        # Activity section
-        y += 100
-        dwg.add(dwg.text(
-            "Recent Activity",
-            insert=(20, y),
-            fill=self.colors['text'],
-            style='font-family: SF Pro Text; font-size: 15px; font-weight: 600'
-        ))
-        
-        # Activity list
-        y += 20
-        for i in range(3):
-            dwg.add(dwg.rect(
-                (20, y + i*60),
-                (self.screen_width - 40, 50),
-                rx=8, ry=8,
-                fill=self.colors['surface']
-            ))
-            dwg.add(dwg.text(
-                f"Activity {i+1}",
-                insert=(40, y + i*60 + 30),
-                fill=self.colors['text'],
-                style='font-family: SF Pro Text; font-size: 15px'
-            ))
-        
-        return dwg
+def fill_placeholders(wireframes, cache, slots, profile=None, list_params=None):
+    """Render every reserved screen on the worker pool, embedding each as it finishes"""
+    pool = get_render_pool()
+    futures = {}
+    for screen, placeholder, caption in slots:
+        stats = None if profile is None else {'screen': screen}
+        future = pool.submit(
+            wireframes.render, screen, cache, stats, **screen_params(screen, list_params)
+        )
+        futures[future] = (placeholder, caption, stats)
+    # Streamlit elements may only be written from the script thread
+    for future in as_completed(futures):
+        placeholder, caption, stats = futures[future]
+        if stats is None:
+            placeholder.markdown(future.result(), unsafe_allow_html=True)
+        else:
+            embed_screen(placeholder, future.result(), stats, caption, profile)
 
-    def create_user_preferences_screen(self):
-        """Create user preferences screen wireframe"""
-        dwg = self.create_base_screen("preferences")
-        self.add_nav_bar(dwg, "Preferences")
-        
-        # Music preferences
-        y = 108
-        dwg.add(dwg.text(
-            "Music Preferences",
-            insert=(20, y),
-            fill=self.colors['text'],
-            style='font-family: SF Pro Text; font-size: 17px; font-weight: 600'
-        ))
-        
-        # Genre selection
-        y += 40
-        genres = ['Hip Hop', 'R&B', 'Pop', 'Rock']
-        for genre in genres:
-            dwg.add(dwg.rect(
-                (20, y),
-                (self.screen_width - 40, 50),
-                rx=8, ry=8,
-                fill='none',
-                stroke=self.colors['border']
-            ))
-            dwg.add(dwg.text(
-                genre,
-                insert=(40, y + 30),
-                fill=self.colors['text'],
-                style='font-family: SF Pro Text; font-size: 15px'
-            ))
-            # Checkbox
-            dwg.add(dwg.rect(
-                (self.screen_width - 60, y + 15),
-                (20, 20),
-                rx=4, ry=4,
-                fill='none',
-                stroke=self.colors['border']
-            ))
-            y += 60
-        
-        # Save button
-        dwg.add(dwg.rect(
-            (20, self.screen_height - 80),
-            (self.screen_width - 40, 50),
-            rx=25, ry=25,
-            fill=self.colors['primary']
-        ))
-        dwg.add(dwg.text(
-            "Save Preferences",
-            insert=(self.screen_width/2, self.screen_height - 45),
-            text_anchor='middle',
-            fill='white',
-            style='font-family: SF Pro Text; font-size: 17px; font-weight: 600'
-        ))
-        
-        return dwg
+def show_profile_summary(profile):
+    """Page-level totals for every screen rendered on this run"""
+    def total(key):
+        return sum(stats[key] or 0 for stats in profile)
+
+    def cost(stats):
+        return (stats['build_ms'] or 0) + (stats['serialize_ms'] or 0) + stats['embed_ms']
+
+    hits = sum(stats['cache'] == 'hit' for stats in profile)
+    st.sidebar.markdown("### Render profile")
+    st.sidebar.markdown(
+        f"- Screens: {len(profile)} ({hits} cache hits)\n"
+        f"- Build: {format_ms(total('build_ms'))}\n"
+        f"- Serialize: {format_ms(total('serialize_ms'))}\n"
+        f"- Embed: {format_ms(total('embed_ms'))}\n"
+        f"- Payload: {total('bytes'):,} bytes"
+    )
+    if profile:
+        st.sidebar.caption(f"Slowest: {max(profile, key=cost)['screen']}")
+
+def show_inspector(wireframes, screens, list_params=None):
+    """Sidebar hit test: which elements of a screen sit at a point"""
+    with st.sidebar.expander("Inspect element"):
+        screen = st.selectbox("Screen", screens)
+        width, height = wireframes.screen_width, wireframes.screen_height
+        x = st.number_input("x (px)", min_value=0, max_value=width, value=width // 2)
+        y = st.number_input("y (px)", min_value=0, max_value=height, value=height // 2)
+        params = screen_params(screen, list_params)
+        # One index per rendered screen variant, reused for every query
+        indexes = st.session_state.setdefault('hit_indexes', {})
+        key = wireframes.cache_key(screen, params)
+        if key not in indexes:
+            if len(indexes) >= 64:
+                indexes.clear()
+            indexes[key] = inspect_screen(wireframes, screen, **params)
+        hits = indexes[key].hit(x, y)
+        if not hits:
+            st.caption("Nothing here")
+        for info in hits:
+            left, top, right, bottom = info.bounds
+            text = f' "{info.text}"' if info.text else ""
+            st.markdown(
+                f"**{info.role}** `<{info.tag}>`{text}  \n"
+                f"({left:.0f}, {top:.0f}) – ({right:.0f}, {bottom:.0f}) · `{info.source}`"
+            )
+
+def render_section(name, screens, show):
+    """Show one journey section, side by side when it has several screens
+
+    show(screen) puts one screen in the current container.
+    """
+    st.title(f"User Journey - {name}")
+    if len(screens) == 1:
+        _, screen, _ = screens[0]
+        show(screen)
+        return
+
+    for column, (subheader, screen, next_label) in zip(st.columns(len(screens)), screens):
+        with column:
+            st.subheader(subheader)
+            show(screen)
+            if next_label:
+                st.button(
+                    f"Next: {next_label}", key=f"next-{screen}",
+                    on_click=go_to, args=(NEXT_SCREENS[next_label],)
+                )
 
 def main():
     st.set_page_config(layout="wide", page_title="User Journey Wireframes")
     
-    st.markdown("""
+    # Switching theme only replaces the palette rule; no screen re-renders
+    theme = st.sidebar.selectbox("Theme", list(PALETTES))
+    st.markdown(f"""
         <style>
-        .stApp {
+        .stApp {{
             background-color: #1E1E1E;
             color: #FFFFFF;
-        }
+        }}
+        {palette_css(PALETTES[theme])}
         </style>
     """, unsafe_allow_html=True)
     
-    wireframes = UserAppWireframes()
-    
-    st.title("User Journey - Welcome Flow")
-    
-    # Show first screen
-    welcome_screen = wireframes.create_welcome_screen()
-    st.markdown(welcome_screen.tostring(), unsafe_allow_html=True)
-
-    st.title("User Journey - Discovery Flow")
-    
-    col1, col2 = st.columns(2)
-    with col1:
-        st.subheader("Discovery Screen")
-        discovery = wireframes.create_user_discovery_screen()
-        st.markdown(discovery.tostring(), unsafe_allow_html=True)
-        st.markdown("**Next:** Playlist Creation")
+    wireframes = get_wireframes()
+    # Shared across reruns and sessions so each screen variant is built once
+    cache = get_render_cache()
     
-    with col2:
-        st.subheader("Playlist Screen")
-        playlist = wireframes.create_playlist_screen()
-        st.markdown(playlist.tostring(), unsafe_allow_html=True)
-        st.markdown("**Next:** Community")
+    # Only the selected flow is built and serialized; others render the
+    # first time they are opened and come from the cache after that
+    flow = st.sidebar.radio("User Journey", SECTION_NAMES + (ALL_FLOWS,), key='flow')
+    profiling = st.sidebar.checkbox(
+        "Profile rendering",
+        value=os.environ.get('WIREFRAME_PROFILE', '') not in ('', '0')
+    )
+    profile = [] if profiling else None
+    progressive = st.sidebar.checkbox("Progressive rendering")
 
-    st.title("User Journey - Engagement Flow")
-    
-    col3, col4 = st.columns(2)
-    with col3:
-        st.subheader("Community Feed")
-        engagement = wireframes.create_engagement_screen()
-        st.markdown(engagement.tostring(), unsafe_allow_html=True)
-        st.markdown("**Next:** Events")
-    
-    with col4:
-        st.subheader("Events")
-        events = wireframes.create_events_screen()
-        st.markdown(events.tostring(), unsafe_allow_html=True)
-        st.markdown("**Next:** Premium Features")
-
-    st.title("User Journey - Premium Features")
-    
-    col5, col6 = st.columns(2) 
-    with col5:
-        st.subheader("Premium Features")
-        premium = wireframes.create_premium_features_screen()
-        st.markdown(premium.tostring(), unsafe_allow_html=True)
-        st.markdown("**Next:** Exclusive Content")
-    
-    with col6:
-        st.subheader("Exclusive Content")
-        exclusive = wireframes.create_exclusive_content_screen()
-        st.markdown(exclusive.tostring(), unsafe_allow_html=True)
-
-    st.title("User Journey - Content Management")
-    
-    col7, col8 = st.columns(2)
-    with col7:
-        st.subheader("My Library")
-        content = wireframes.create_user_content_screen()
-        st.markdown(content.tostring(), unsafe_allow_html=True)
-        st.markdown("**Next:** Favorites")
-    
-    with col8:
-        st.subheader("Favorites")
-        favorites = wireframes.create_user_favorites_screen()
-        st.markdown(favorites.tostring(), unsafe_allow_html=True)
-        st.markdown("**Next:** Community")
-    
-    st.title("User Journey - Profile & Analytics")
-    
-    col9, col10 = st.columns(2)
-    with col9:
-        st.subheader("Analytics")
-        analytics = wireframes.create_user_analytics_screen()
-        st.markdown(analytics.tostring(), unsafe_allow_html=True)
-        st.markdown("**Next:** Profile")
-    
-    with col10:
-        st.subheader("Profile")
-        profile = wireframes.create_user_profile_screen()
-        st.markdown(profile.tostring(), unsafe_allow_html=True)
-
-    st.title("User Journey - Profile & Preferences")
-    
-    col11, col12 = st.columns(2)
-    with col11:
-        st.subheader("User Profile")
-        profile = wireframes.create_user_profile_screenb()
-        st.markdown(profile.tostring(), unsafe_allow_html=True)
-        st.markdown("**Next:** Preferences")
-    
-    with col12:
-        st.subheader("User Preferences")
-        preferences = wireframes.create_user_preferences_screen()
-        st.markdown(preferences.tostring(), unsafe_allow_html=True)
-
-    st.markdown("""
-        ### User Journey Flow Description
-
-        1. **Registration Flow**
-        - Welcome → Account Creation → Profile Setup
-        - Sign up and personalize experience
-
-        2. **Discovery Flow**
-        - Browse Athletes → Search Interface → Playlist Creation
-        - Find and collect favorite music
-
-        3. **Engagement Flow**
-        - Community Feed → Events Calendar
-        - Connect with athletes and attend events
-
-        4. **Premium Features**
-        - Premium Plans → Exclusive Content
-        - Access VIP features and special events
+    # Stress mode fills list screens with many items; only the visible
+    # window is built, so large counts cost the same as small ones
+    list_params = None
+    with st.sidebar.expander("Stress mode"):
+        if st.checkbox("Override list sizes"):
+            list_params = {
+                'item_count': int(st.number_input("Items per list", min_value=0, value=10000, step=1000)),
+                'scroll_offset': int(st.number_input("Scroll offset (px)", min_value=0, value=0, step=60))
+            }
 
-        5. **Content Access**
-        - Library Management → Favorites
-        - Organize personal collection and playlists
+    # Progressive mode lays out every section first and fills the screens
+    # in as worker threads finish them, so the page appears at once
+    if progressive:
+        slots = []
+        show = partial(add_placeholder, slots, profiling)
+    else:
+        show = partial(show_screen, wireframes, cache, profile=profile, list_params=list_params)
+    shown = []
+    for name, screens in SECTIONS:
+        if flow in (name, ALL_FLOWS):
+            render_section(name, screens, show)
+            shown.extend(screen for _, screen, _ in screens)
+    if progressive:
+        fill_placeholders(wireframes, cache, slots, profile, list_params)
+    # Likely next steps render in the background while the user reads this one
+    prefetch_next(wireframes, cache, shown, list_params)
+    show_inspector(wireframes, shown, list_params)
+    if profiling:
+        show_profile_summary(profile)
 
-        This journey flow shows:
-        - Clear user progression from registration to premium features
-        - Focus on discovery and engagement
-        - Emphasis on community participation
-        - Path to exclusive content access
-        """)
+    st.markdown(FLOW_DESCRIPTION)
 
 
 if __name__ == "__main__":
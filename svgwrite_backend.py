@@ -0,0 +1,16 @@
+"""svgwrite drawing backend: the validated reference implementation."""
+import svgwrite
+
+
+class Drawing(svgwrite.Drawing):
+    """svgwrite Drawing that can fold presentation attributes into a stylesheet"""
+
+    def __init__(self, size=('100%', '100%'), stylesheet=None, **extra):
+        super().__init__(size=size, **extra)
+        self.stylesheet = stylesheet
+
+    def get_xml(self):
+        xml = super().get_xml()
+        if self.stylesheet is not None:
+            self.stylesheet.apply_to_xml(xml)
+        return xml
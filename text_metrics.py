@@ -0,0 +1,107 @@
+"""Text measurement from bundled per-glyph advance widths.
+
+Widths are in 1/1000 em for the printable ASCII range (32-126). SF Pro is
+not redistributable, so the SF Pro Text and system stacks the screens use
+are measured with the Helvetica core-font metrics, which are close enough
+for wireframe layout. Results are memoized per (text, family, size, weight).
+"""
+import re
+from functools import lru_cache
+
+REGULAR_WIDTHS = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+)
+
+BOLD_WIDTHS = (
+    278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+    975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+    333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+    611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+)
+
+# Glyphs outside ASCII that the screens use
+EXTRA_WIDTHS = {'•': 350, '…': 1000, '’': 222, '“': 333, '”': 333, '–': 556, '—': 1000}
+DEFAULT_WIDTH = 556
+
+# (regular, bold) width tables per font family, matched case-insensitively
+FONT_TABLES = {
+    'sf pro text': (REGULAR_WIDTHS, BOLD_WIDTHS),
+    '-apple-system': (REGULAR_WIDTHS, BOLD_WIDTHS),
+    'helvetica': (REGULAR_WIDTHS, BOLD_WIDTHS),
+}
+DEFAULT_FAMILY = 'SF Pro Text'
+DEFAULT_SIZE = 16
+
+FONT_FAMILY = re.compile(r'font-family:\s*([^;]+)')
+FONT_SIZE = re.compile(r'font-size:\s*([\d.]+)px')
+FONT_WEIGHT = re.compile(r'font-weight:\s*(\w+)')
+
+
+def font_tables(family):
+    """Width tables for the first family in a CSS stack that has metrics"""
+    for name in family.split(','):
+        tables = FONT_TABLES.get(name.strip().strip('\'"').lower())
+        if tables is not None:
+            return tables
+    return FONT_TABLES[DEFAULT_FAMILY.lower()]
+
+
+def is_bold(weight):
+    weight = str(weight).lower()
+    return weight in ('bold', 'bolder') or (weight.isdigit() and int(weight) >= 600)
+
+
+def glyph_width(char, table):
+    code = ord(char)
+    if 32 <= code <= 126:
+        return table[code - 32]
+    return EXTRA_WIDTHS.get(char, DEFAULT_WIDTH)
+
+
+@lru_cache(maxsize=65536)
+def text_width(text, family=DEFAULT_FAMILY, size=DEFAULT_SIZE, weight='normal'):
+    """Advance width in px of a single line of text"""
+    regular, bold = font_tables(family)
+    table = bold if is_bold(weight) else regular
+    return sum(glyph_width(char, table) for char in text) * size / 1000
+
+
+@lru_cache(maxsize=1024)
+def parse_font(style):
+    """(family, size, weight) from an inline CSS style string"""
+    family = FONT_FAMILY.search(style or '')
+    size = FONT_SIZE.search(style or '')
+    weight = FONT_WEIGHT.search(style or '')
+    return (
+        family.group(1).strip() if family else DEFAULT_FAMILY,
+        float(size.group(1)) if size else DEFAULT_SIZE,
+        weight.group(1) if weight else 'normal'
+    )
+
+
+def style_width(text, style):
+    """Advance width in px of text drawn with an inline CSS style"""
+    return text_width(text, *parse_font(style))
+
+
+def truncate(text, max_width, family=DEFAULT_FAMILY, size=DEFAULT_SIZE,
+             weight='normal', ellipsis='…'):
+    """Shorten text with an ellipsis so it fits within max_width px"""
+    if text_width(text, family, size, weight) <= max_width:
+        return text
+    regular, bold = font_tables(family)
+    table = bold if is_bold(weight) else regular
+    budget = max_width * 1000 / size - sum(glyph_width(char, table) for char in ellipsis)
+    used = 0
+    for end, char in enumerate(text):
+        used += glyph_width(char, table)
+        if used > budget:
+            return text[:end].rstrip() + ellipsis
+    return text
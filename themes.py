@@ -0,0 +1,52 @@
+"""Color palettes, and CSS custom properties for palette-independent screens.
+
+UserAppWireframes(css_vars=True) draws every palette color as
+var(--wf-<name>) instead of its value, so one rendered SVG serves every
+palette and caches once. The palette is then a single CSS rule: put
+palette_css() anywhere on the page embedding the screens, or give a
+standalone SVG file its own with apply_palette().
+"""
+from html import escape
+
+# Prefixed so the variables cannot clash with the host page's own
+VAR_PREFIX = '--wf-'
+
+LIGHT = {
+    'background': '#FFFFFF',
+    'text': '#000000',
+    'primary': '#007AFF',
+    'secondary': '#666666',
+    'border': '#C5C5C7',
+    'surface': '#F5F5F5'
+}
+
+DARK = {
+    'background': '#1C1C1E',
+    'text': '#FFFFFF',
+    'primary': '#0A84FF',
+    'secondary': '#98989F',
+    'border': '#3A3A3C',
+    'surface': '#2C2C2E'
+}
+
+PALETTES = {
+    'Light': LIGHT,
+    'Dark': DARK
+}
+
+
+def variables(names):
+    """Colors dict drawing each named color as its custom property"""
+    return {name: f'var({VAR_PREFIX}{name})' for name in names}
+
+
+def palette_css(colors, selector=':root'):
+    """CSS rule defining the custom property of every color in colors"""
+    declarations = ';'.join(f'{VAR_PREFIX}{name}:{value}' for name, value in sorted(colors.items()))
+    return f'{selector}{{{declarations}}}'
+
+
+def apply_palette(svg, colors):
+    """A standalone copy of a css_vars SVG with colors defined inside it"""
+    end = svg.index('>', svg.index('<svg')) + 1
+    return f'{svg[:end]}<style>{escape(palette_css(colors), quote=False)}</style>{svg[end:]}'
@@ -0,0 +1,1097 @@
+import math
+import time
+import zlib
+from contextlib import contextmanager
+from functools import partial, wraps
+
+from culling import CullingDrawing, clipped_group
+from layout import FILL, Box, VStack, draw_layout
+from screen_registry import BACKENDS, LIST_SCREENS, SCREENS, drawing_class
+from screen_specs import PLANS
+from stylesheet import StyleSheet
+from text_metrics import text_width, truncate
+from themes import LIGHT, variables
+
+
+def draws(role):
+    """Decorator marking the elements a helper creates as part of role"""
+    def decorate(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.parts is None:
+                return method(self, *args, **kwargs)
+            with self.part(role):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorate
+
+def count_elements(dwg):
+    """Number of SVG elements in a drawing, including <defs> content"""
+    pending = list(dwg.elements)
+    if not any(element is dwg.defs for element in pending):
+        pending.append(dwg.defs)
+    count = 0
+    while pending:
+        element = pending.pop()
+        count += 1
+        pending.extend(getattr(element, 'elements', ()))
+    return count
+
+# Subscription plans shown on the premium features screen
+PREMIUM_PLANS = (
+    {
+        'name': 'Basic',
+        'price': '$0',
+        'features': 'Previews + Limited access',
+        'selected': False
+    },
+    {
+        'name': 'Plus',
+        'price': '$6.99',
+        'features': 'Basic streaming access',
+        'selected': False
+    },
+    {
+        'name': 'Pro',
+        'price': '$9.99',
+        'features': 'Unlimited streaming + Downloads',
+        'selected': True
+    },
+    {
+        'name': 'Elite',
+        'price': '$17.99',
+        'features': 'All features + VIP access',
+        'selected': False
+    }
+)
+
+class UserAppWireframes:
+    def __init__(self, backend='svgwrite', symbols=False, stylesheet=False, cull=False, css_vars=False):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend {backend!r}, expected one of {sorted(BACKENDS)}")
+        if css_vars and backend == 'svgwrite':
+            raise ValueError("css_vars needs the fast or columnar backend; svgwrite rejects var() colors")
+        self.backend = backend
+        # Emit repeated list geometry once in <defs> and instance it with <use>
+        self.symbols = symbols
+        # Replace inline fills and font styles with classes in a <style> block
+        self.stylesheet = stylesheet
+        # Drop elements outside the phone frame and clip those crossing it
+        self.cull = cull
+        # Layout trees reused across renders, keyed by what shapes them
+        self.layouts = {}
+        # Stack of what the elements being created are part of, innermost
+        # last; a list only while an inspector records it (see hit_test)
+        self.parts = None
+        self.screen_width = 360
+        self.screen_height = 640
+        self.padding = 20
+        self.colors = dict(LIGHT)
+        # Draw colors as CSS custom properties, leaving the palette to the
+        # page (see themes.py); the output and cache key are then the same
+        # for every palette
+        self.css_vars = css_vars
+        if css_vars:
+            self.colors = variables(self.colors)
+
+    def cache_key(self, screen, params=None):
+        """Key covering everything that affects a screen's rendered output"""
+        return (
+            screen,
+            tuple(sorted((params or {}).items())),
+            tuple(sorted(self.colors.items())),
+            self.screen_width,
+            self.screen_height,
+            self.padding,
+            self.backend,
+            self.symbols,
+            self.stylesheet,
+            self.cull
+        )
+
+    def render(self, screen, cache=None, stats=None, **params):
+        """Render a create_* or spec screen to an SVG string, reusing cached output
+
+        Keyword params are passed on to the screen builder, such as the
+        item_count and scroll_offset of list screens.
+
+        When a stats dict is passed it is filled with the cache status
+        ('hit', 'miss' or 'off'), build and serialization milliseconds,
+        element count, culled and clipped element counts and byte size;
+        all but the cache status and size are None on a cache hit.
+        """
+        if stats is not None:
+            stats.update(
+                cache='off' if cache is None else 'hit',
+                build_ms=None, serialize_ms=None, elements=None,
+                culled=None, clipped=None
+            )
+
+        def build():
+            if stats is None:
+                return self.build(screen, **params).tostring()
+            start = time.perf_counter()
+            dwg = self.build(screen, **params)
+            built = time.perf_counter()
+            svg = dwg.tostring()
+            stats.update(
+                build_ms=(built - start) * 1000,
+                serialize_ms=(time.perf_counter() - built) * 1000,
+                elements=count_elements(dwg),
+                culled=len(getattr(dwg, 'culled', ())),
+                clipped=getattr(dwg, 'clipped', 0)
+            )
+            if cache is not None:
+                stats['cache'] = 'miss'
+            return svg
+
+        svg = build() if cache is None else cache.get_or_render(self.cache_key(screen, params), build)
+        if stats is not None:
+            stats['bytes'] = len(svg.encode('utf-8'))
+        return svg
+
+    def build(self, screen, **params):
+        """Build a create_* screen or a screen registered from a spec"""
+        plan = PLANS.get(screen)
+        if plan is not None:
+            return plan.run(self, **params)
+        return getattr(self, screen)(**params)
+
+    def new_drawing(self):
+        """Empty drawing of the configured backend at the screen size"""
+        return drawing_class(self.backend)(
+            size=(self.screen_width, self.screen_height),
+            stylesheet=StyleSheet() if self.stylesheet else None
+        )
+
+    @contextmanager
+    def part(self, role):
+        """Mark the elements created inside the block as part of role"""
+        if self.parts is None:
+            yield
+            return
+        self.parts.append(role)
+        try:
+            yield
+        finally:
+            self.parts.pop()
+
+    @draws('base screen')
+    def create_base_screen(self, name):
+        """Create base screen with iPhone frame"""
+        dwg = self.new_drawing()
+        if self.cull:
+            dwg = CullingDrawing(dwg, (self.screen_width, self.screen_height))
+        
+        # Phone frame
+        dwg.add(dwg.rect(
+            (0, 0),
+            (self.screen_width, self.screen_height),
+            rx=40, ry=40,
+            fill=self.colors['background'],
+            stroke=self.colors['border'],
+            stroke_width=2
+        ))
+        
+        # Status bar
+        dwg.add(dwg.rect(
+            (0, 0),
+            (self.screen_width, 44),
+            fill=self.colors['surface']
+        ))
+        
+        # Notch
+        dwg.add(dwg.rect(
+            (self.screen_width/2 - 60, 0),
+            (120, 30),
+            rx=15, ry=15,
+            fill='#333333'
+        ))
+        
+        return dwg
+
+    @draws('nav bar')
+    def add_nav_bar(self, dwg, title, show_back=True):
+        """Add navigation bar to screen"""
+        # Nav bar background
+        dwg.add(dwg.rect(
+            (0, 44),
+            (self.screen_width, 44),
+            fill=self.colors['background']
+        ))
+        
+        # Back button if needed
+        if show_back:
+            dwg.add(dwg.path(
+                d=f'M 20,66 L 35,58 L 35,74 Z',
+                fill=self.colors['primary']
+            ))
+        
+        # Title, kept clear of the back button on both sides
+        dwg.add(dwg.text(
+            truncate(title, self.screen_width - 2*44, 'SF Pro Text', 17, '600'),
+            insert=(self.screen_width/2, 74),
+            text_anchor='middle',
+            fill=self.colors['text'],
+            style='font-family: SF Pro Text; font-size: 17px; font-weight: 600'
+        ))
+
+    def list_window(self, top, step, height, count, scroll_offset=0, bottom=None):
+        """Yield (index, y) for the list items visible between top and bottom
+
+        Items are height tall, laid out every step pixels from top and
+        scrolled up by scroll_offset. Only the visible window is produced, so
+        the cost does not depend on count. bottom defaults to the screen edge.
+        """
+        if bottom is None:
+            bottom = self.screen_height
+        first = max(0, math.floor((scroll_offset - height) / step) + 1)
+        stop = min(count, math.ceil((bottom - top + scroll_offset) / step))
+        for i in range(first, stop):
+            yield i, top + i*step - scroll_offset
+
+    @contextmanager
+    def list_viewport(self, dwg, top, step, height, count, scroll_offset=0, bottom=None, parent=None):
+        """Yield (items, window) for a list scrolled between top and bottom
+
+        window is list_window's (index, y) pairs and items what to add their
+        elements to. When a row is cut by top or bottom, items is a group
+        clipped to the list, added to parent (dwg by default) when the block
+        ends, so partly scrolled rows never cover what is around the list.
+        """
+        if bottom is None:
+            bottom = self.screen_height
+        if parent is None:
+            parent = dwg
+        window = list(self.list_window(top, step, height, count, scroll_offset, bottom))
+        if not window or (window[0][1] >= top and window[-1][1] + height <= bottom):
+            yield parent, window
+            return
+        items = clipped_group(dwg, (0, top, self.screen_width, bottom))
+        yield items, window
+        parent.add(items)
+
+    def add_component(self, dwg, name, insert, parent=None, **params):
+        """Draw a repeated component, as a <use> of a shared symbol when enabled
+
+        Its elements are added to parent, dwg by default.
+        """
+        draw = getattr(self, f'draw_{name}')
+        if parent is None:
+            parent = dwg
+        if not self.symbols:
+            draw(dwg, parent, insert, **params)
+            return
+        if not hasattr(dwg, 'symbol_ids'):
+            dwg.symbol_ids = {}
+        key = (name, tuple(sorted(params.items())))
+        symbol_id = dwg.symbol_ids.get(key)
+        if symbol_id is None:
+            symbol_id = dwg.symbol_ids[key] = self.symbol_id(key)
+            symbol = dwg.g(id=symbol_id)
+            draw(dwg, symbol, (0, 0), **params)
+            dwg.defs.add(symbol)
+        with self.part(name.replace('_', ' ')):
+            parent.add(dwg.use('#' + symbol_id, insert=insert))
+
+    def symbol_id(self, key):
+        """Id of the symbol add_component draws for key"""
+        # Ids are shared by every inline SVG on the page, so derive them
+        # from the symbol's content: equal ids always mean equal symbols
+        digest = zlib.crc32(repr((key, sorted(self.colors.items()))).encode())
+        return f'c{digest:08x}'
+
+    @draws('list card')
+    def draw_list_card(self, dwg, parent, insert, width, height, outline=False,
+                       media=None, avatar=None, action=None):
+        """Draw a list card with optional media block, avatar and trailing action
+
+        media is a (width, height) placeholder anchored at the card corner,
+        avatar a (cx, cy, r) circle relative to the card, and action one of
+        'add', 'favorite', 'rsvp', 'select', 'selected' or 'checkbox'.
+        """
+        x, y = insert
+        if outline:
+            card_style = {'fill': 'none', 'stroke': self.colors['border']}
+        else:
+            card_style = {'fill': self.colors['surface']}
+        parent.add(dwg.rect(
+            (x, y),
+            (width, height),
+            rx=8, ry=8,
+            **card_style
+        ))
+        if media:
+            parent.add(dwg.rect(
+                (x, y),
+                media,
+                rx=8, ry=8,
+                fill='#E5E5EA'
+            ))
+        if avatar:
+            cx, cy, r = avatar
+            parent.add(dwg.circle(
+                (x + cx, y + cy),
+                r,
+                fill='#E5E5EA'
+            ))
+        if action == 'add':
+            parent.add(dwg.circle(
+                (x + width - 25, y + 25),
+                15,
+                fill=self.colors['primary']
+            ))
+            parent.add(dwg.text(
+                "+",
+                insert=(x + width - 25, y + 30),
+                text_anchor='middle',
+                fill='white',
+                style='font-family: SF Pro Text; font-size: 20px'
+            ))
+        elif action == 'favorite':
+            parent.add(dwg.circle(
+                (x + width - 20, y + 30),
+                15,
+                fill=self.colors['primary']
+            ))
+        elif action == 'rsvp':
+            parent.add(dwg.rect(
+                (x + width - 80, y + 75),
+                (60, 30),
+                rx=15, ry=15,
+                fill=self.colors['primary']
+            ))
+            parent.add(dwg.text(
+                "RSVP",
+                insert=(x + width - 50, y + 95),
+                text_anchor='middle',
+                fill='white',
+                style='font-family: SF Pro Text; font-size: 13px'
+            ))
+        elif action in ('select', 'selected'):
+            selected = action == 'selected'
+            parent.add(dwg.rect(
+                (x + width - 80, y + 45),
+                (60, 30),
+                rx=15, ry=15,
+                fill=self.colors['primary'] if selected else 'none',
+                stroke=self.colors['primary']
+            ))
+            parent.add(dwg.text(
+                "Select",
+                insert=(x + width - 50, y + 65),
+                text_anchor='middle',
+                fill='white' if selected else self.colors['primary'],
+                style='font-family: -apple-system, SF Pro Text, Helvetica; font-size: 13px'
+            ))
+        elif action == 'checkbox':
+            parent.add(dwg.rect(
+                (x + width - 40, y + 15),
+                (20, 20),
+                rx=4, ry=4,
+                fill='none',
+                stroke=self.colors['border']
+            ))
+
+    def create_welcome_screen(self):
+        """Create user welcome screen"""
+        dwg = self.create_base_screen("welcome")
+        self.add_nav_bar(dwg, "Welcome", show_back=False)
+        
+        # App logo
+        dwg.add(dwg.circle(
+            (self.screen_width/2, 180),
+            50,
+            fill=self.colors['primary']
+        ))
+        
+        # Welcome text
+        dwg.add(dwg.text(
+            "Welcome to Ball Talk",
+            insert=(self.screen_width/2, 280),
+            text_anchor='middle',
+            fill=self.colors['text'],
+            style='font-family: SF Pro Text; font-size: 24px; font-weight: 600'
+        ))
+        
+        # Description
+        dwg.add(dwg.text(
+            "Connect with your favorite athletes",
+            insert=(self.screen_width/2, 320),
+            text_anchor='middle',
+            fill=self.colors['secondary'],
+            style='font-family: SF Pro Text; font-size: 16px'
+        ))
+        
+        # Sign up buttons
+        y = self.screen_height - 200
+        buttons = [
+            {'text': 'Continue with Email', 'primary': True},
+            {'text': 'Continue with Social', 'primary': False}
+        ]
+        
+        for button in buttons:
+            dwg.add(dwg.rect(
+                (20, y),
+                (self.screen_width - 40, 50),
+                rx=25, ry=25,
+                fill=self.colors['primary'] if button['primary'] else 'none',
+                stroke=self.colors['primary']
+            ))
+            dwg.add(dwg.text(
+                button['text'],
+                insert=(self.screen_width/2, y + 32),
+                text_anchor='middle',
+                fill='white' if button['primary'] else self.colors['primary'],
+                style='font-family: SF Pro Text; font-size: 17px; font-weight: 600'
+            ))
+            y += 70
+        
+        return dwg
+    def create_user_discovery_screen(self, item_count=4, scroll_offset=0):
+        """Create user discovery screen wireframe"""
+        dwg = self.create_base_screen("discovery")
+        self.add_nav_bar(dwg, "Discover")
+        
+        # Search bar
+        y = 108
+        dwg.add(dwg.rect(
+            (20, y),
+            (self.screen_width - 40, 44),
+            rx=22, ry=22,
+            fill=self.colors['surface']
+        ))
+        dwg.add(dwg.text(
+            "Search athletes, leagues...",
+            insert=(50, y + 28),
+            fill=self.colors['secondary'],
+            style='font-family: SF Pro Text; font-size: 15px'
+        ))
+        
+    # Filter chips
+        y += 64
+        filters = ['All', 'NBA', 'NFL', 'MLB']
+        x = 20
+        for filter_text in filters:
+            # Label width plus 16px of padding on each side
+            width = math.ceil(text_width(filter_text, 'SF Pro Text', 13)) + 32
+            dwg.add(dwg.rect(
+                (x, y),
+                (width, 32),
+                rx=16, ry=16,
+                fill=self.colors['surface'] if filter_text == 'All' else 'none',
+                stroke=self.colors['border']
+            ))
+            dwg.add(dwg.text(
+                filter_text,
+                insert=(x + width/2, y + 20),
+                text_anchor='middle',
+                fill=self.colors['primary'] if filter_text == 'All' else self.colors['text'],
+                style='font-family: SF Pro Text; font-size: 13px'
+            ))
+            x += width + 10
+    
+    # Featured Athletes
+        y += 60
+        dwg.add(dwg.text(
+            "Featured Athletes",
+            insert=(20, y),
+            fill=self.colors['text'],
+            style='font-family: SF Pro Text; font-size: 17px; font-weight: 600'
+        ))
+    
+    # Artist grid
+        y += 20
+        with self.list_viewport(
+            dwg, y, 120, 100, item_count, scroll_offset
+        ) as (items, window):
+            for _, item_y in window:
+                # Card with artist avatar
+                self.add_component(
+                    dwg, 'list_card', (20, item_y), parent=items,
+                    width=self.screen_width - 40, height=100, avatar=(40, 50, 30)
+                )
+                # Artist info
+                items.add(dwg.text(
+                    f"Athlete Name",
+                    insert=(100, item_y + 40),
+                    fill=self.colors['text'],
+                    style='font-family: SF Pro Text; font-size: 15px; font-weight: 600'
+                ))
+                items.add(dwg.text(
+                    "NBA • Detroit Pistons",
+                    insert=(100, item_y + 60),
+                    fill=self.colors['secondary'],
+                    style='font-family: SF Pro Text; font-size: 13px'
+                ))
+        return dwg
+
+    def create_playlist_screen(self, item_count=5, scroll_offset=0):
+        """Create playlist creation screen"""
+        dwg = self.create_base_screen("playlist")
+        self.add_nav_bar(dwg, "Create Playlist")
+        
+        # Playlist name input
+        y = 108
+        dwg.add(dwg.text(
+            "Playlist Name",
+            insert=(20, y),
+            fill=self.colors['text'],
+            style='font-family: SF Pro Text; font-size: 15px'
+        ))
+        dwg.add(dwg.rect(
+            (20, y + 10),
+            (self.screen_width - 40, 44),
+            rx=8, ry=8,
+            fill='none',
+            stroke=self.colors['border']
+        ))
+        
+        # Track selection
+        y += 84
+        dwg.add(dwg.text(
+            "Add Tracks",
+            insert=(20, y),
+            fill=self.colors['text'],
+            style='font-family: SF Pro Text; font-size: 15px'
+        ))
+        
+        # Track list
+        with self.list_viewport(
+            dwg, y + 20, 60, 50, item_count, scroll_offset,
+            bottom=self.screen_height - 80
+        ) as (items, window):
+            for i, item_y in window:
+                # Card with add button
+                self.add_component(
+                    dwg, 'list_card', (20, item_y), parent=items,
+                    width=self.screen_width - 40, height=50, action='add'
+                )
+                # Track info
+                items.add(dwg.text(
+                    f"Track {i+1}",
+                    insert=(40, item_y + 25),
+                    fill=self.colors['text'],
+                    style='font-family: SF Pro Text; font-size: 15px'
+                ))
+        
+        # Create button
+        dwg.add(dwg.rect(
+            (20, self.screen_height - 80),
+            (self.screen_width - 40, 50),
+            rx=25, ry=25,
+            fill=self.colors['primary']
+        ))
+        dwg.add(dwg.text(
+            "Create Playlist",
+            insert=(self.screen_width/2, self.screen_height - 45),
+            text_anchor='middle',
+            fill='white',
+            style='font-family: SF Pro Text; font-size: 17px; font-weight: 600'
+        ))
+        
+        return dwg
+    def create_engagement_screen(self, item_count=3, scroll_offset=0):
+        """Create user engagement screen wireframe"""
+        dwg = self.create_base_screen("engagement")
+        self.add_nav_bar(dwg, "Community")
+        
+        # Tab bar
+        y = 88
+        tabs = ['Feed', 'Events', 'Messages']
+        tab_width = self.screen_width / len(tabs)
+        for i, tab in enumerate(tabs):
+            # Tab background
+            dwg.add(dwg.rect(
+                (i * tab_width, y),
+                (tab_width, 44),
+                fill=self.colors['surface'] if i == 0 else 'none',
+                stroke=self.colors['border']
+            ))
+            # Tab text
+            dwg.add(dwg.text(
+                tab,
+                insert=(i * tab_width + tab_width/2, y + 28),
+                text_anchor='middle',
+                fill=self.colors['primary'] if i == 0 else self.colors['secondary'],
+                style='font-family: SF Pro Text; font-size: 15px'
+            ))
+        
+        # Community Feed
+        y = 152
+        dwg.add(dwg.text(
+            "Community Feed",
+            insert=(20, y),
+            fill=self.colors['text'],
+            style='font-family: SF Pro Text; font-size: 17px; font-weight: 600'
+        ))
+        
+        # Feed items
+        y += 20
+        with self.list_viewport(
+            dwg, y, 120, 100, item_count, scroll_offset
+        ) as (items, window):
+            for _, item_y in window:
+                # Card with user avatar
+                self.add_component(
+                    dwg, 'list_card', (20, item_y), parent=items,
+                    width=self.screen_width - 40, height=100, avatar=(30, 30, 20)
+                )
+                # Post content
+                items.add(dwg.text(
+                    "Athlete Name",
+                    insert=(80, item_y + 25),
+                    fill=self.colors['text'],
+                    style='font-family: SF Pro Text; font-size: 15px; font-weight: 600'
+                ))
+                items.add(dwg.text(
+                    "Post preview...",
+                    insert=(80, item_y + 45),
+                    fill=self.colors['secondary'],
+                    style='font-family: SF Pro Text; font-size: 13px'
+                ))
+        
+        return dwg
+
+    def create_events_screen(self, item_count=3, scroll_offset=0):
+        """Create events screen wireframe"""
+        dwg = self.create_base_screen("events")
+        self.add_nav_bar(dwg, "Events")
+        
+        # Search bar
+        y = 108
+        dwg.add(dwg.rect(
+            (20, y),
+            (self.screen_width - 40, 44),
+            rx=22, ry=22,
+            fill=self.colors['surface']
+        ))
+        dwg.add(dwg.text(
+            "Search events...",
+            insert=(50, y + 28),
+            fill=self.colors['secondary'],
+            style='font-family: SF Pro Text; font-size: 15px'
+        ))
+        
+        # Upcoming Events
+        y += 64
+        dwg.add(dwg.text(
+            "Upcoming Events",
+            insert=(20, y),
+            fill=self.colors['text'],
+            style='font-family: SF Pro Text; font-size: 17px; font-weight: 600'
+        ))
+        
+        # Event cards
+        y += 20
+        with self.list_viewport(
+            dwg, y, 140, 120, item_count, scroll_offset
+        ) as (items, window):
+            for i, item_y in window:
+                # Card with event image placeholder and RSVP button
+                self.add_component(
+                    dwg, 'list_card', (20, item_y), parent=items,
+                    width=self.screen_width - 40, height=120,
+                    media=(self.screen_width - 40, 60), action='rsvp'
+                )
+                # Event details
+                items.add(dwg.text(
+                    f"Event {i+1}",
+                    insert=(30, item_y + 80),
+                    fill=self.colors['text'],
+                    style='font-family: SF Pro Text; font-size: 15px; font-weight: 600'
+                ))
+                items.add(dwg.text(
+                    "Date & Location",
+                    insert=(30, item_y + 100),
+                    fill=self.colors['secondary'],
+                    style='font-family: SF Pro Text; font-size: 13px'
+                ))
+        
+        return dwg
+    def create_premium_features_screen(self):
+        """Create premium features screen wireframe"""
+        dwg = self.create_base_screen("premium_features")
+        self.add_nav_bar(dwg, "Premium Features")
+        draw_layout(dwg, self.premium_layout(), 0, 88, self.screen_width, self.screen_height - 88)
+        return dwg
+
+    def premium_layout(self):
+        """Layout of the premium plans section, kept so re-layout is cached"""
+        key = ('premium', self.padding)
+        if key not in self.layouts:
+            self.layouts[key] = VStack(
+                [Box(width=FILL, height=20, draw=partial(
+                    self.draw_section_title, "Premium Plans",
+                    'font-family: -apple-system, SF Pro Text, Helvetica; font-size: 17px; font-weight: 600'
+                ))]
+                + [Box(width=FILL, height=100, draw=partial(self.draw_plan_card, plan))
+                   for plan in PREMIUM_PLANS],
+                gap=10, padding=self.padding, width=FILL
+            )
+        return self.layouts[key]
+
+    @draws('section title')
+    def draw_section_title(self, title, style, dwg, x, y, width, height):
+        """Draw a section heading on the baseline of its layout box"""
+        dwg.add(dwg.text(
+            title,
+            insert=(x, y + height - 5),
+            fill=self.colors['text'],
+            style=style
+        ))
+
+    @draws('plan card')
+    def draw_plan_card(self, plan, dwg, x, y, width, height):
+        """Draw one subscription plan card in its layout box"""
+        # Plan container with select button
+        self.add_component(
+            dwg, 'list_card', (x, y),
+            width=width, height=height,
+            action='selected' if plan['selected'] else 'select'
+        )
+        
+        # Plan name
+        dwg.add(dwg.text(
+            plan['name'],
+            insert=(x + 20, y + 30),
+            fill=self.colors['text'],
+            style='font-family: -apple-system, SF Pro Text, Helvetica; font-size: 17px; font-weight: 600'
+        ))
+        
+        # Price with currency symbol
+        dwg.add(dwg.text(
+            plan['price'],
+            insert=(x + 20, y + 60),
+            fill=self.colors['primary'],
+            style='font-family: -apple-system, SF Pro Text, Helvetica; font-size: 24px; font-weight: bold'
+        ))
+        
+        # Features text
+        dwg.add(dwg.text(
+            plan['features'],
+            insert=(x + 20, y + 90),
+            fill=self.colors['secondary'],
+            style='font-family: -apple-system, SF Pro Text, Helvetica; font-size: 13px'
+        ))
+
+    def create_exclusive_content_screen(self):
+        """Create exclusive content screen wireframe"""
+        dwg = self.create_base_screen("exclusive_content")
+        self.add_nav_bar(dwg, "Exclusive Content")
+        
+        # VIP Events section
+        y = 108
+        dwg.add(dwg.text(
+            "VIP Events",
+            insert=(20, y),
+            fill=self.colors['text'],
+            style='font-family: SF Pro Text; font-size: 17px; font-weight: 600'
+        ))
+        
+        # Event cards
+        y += 30
+        for i in range(2):
+            # Card with event image area
+            self.add_component(
+                dwg, 'list_card', (20, y),
+                width=self.screen_width - 40, height=120,
+                media=(self.screen_width - 40, 60)
+            )
+            # Event details
+            dwg.add(dwg.text(
+                f"VIP Event {i+1}",
+                insert=(40, y + 80),
+                fill=self.colors['text'],
+                style='font-family: SF Pro Text; font-size: 15px; font-weight: 600'
+            ))
+            dwg.add(dwg.text(
+                "Exclusive Meet & Greet",
+                insert=(40, y + 100),
+                fill=self.colors['secondary'],
+                style='font-family: SF Pro Text; font-size: 13px'
+            ))
+            y += 140
+        
+        # Premium Content section
+        dwg.add(dwg.text(
+            "Premium Content",
+            insert=(20, y),
+            fill=self.colors['text'],
+            style='font-family: SF Pro Text; font-size: 17px; font-weight: 600'
+        ))
+        
+        # Content grid
+        y += 30
+        for i in range(2):
+            self.add_component(
+                dwg, 'list_card', (20, y),
+                width=self.screen_width - 40, height=80
+            )
+            # Content info
+            dwg.add(dwg.text(
+                f"Exclusive Track {i+1}",
+                insert=(40, y + 30),
+                fill=self.colors['text'],
+                style='font-family: SF Pro Text; font-size: 15px; font-weight: 600'
+            ))
+            dwg.add(dwg.text(
+                "Premium Release",
+                insert=(40, y + 50),
+                fill=self.colors['secondary'],
+                style='font-family: SF Pro Text; font-size: 13px'
+            ))
+            y += 100
+        
+        return dwg
+
+    def create_user_content_screen(self, item_count=3, scroll_offset=0):
+        """Create user content management screen wireframe"""
+        dwg = self.create_base_screen("user_content")
+        self.add_nav_bar(dwg, "My Library")
+        
+        # Search and filter
+        y = 108
+        dwg.add(dwg.rect(
+            (20, y),
+            (self.screen_width - 40, 44),
+            rx=22, ry=22,
+            fill=self.colors['surface']
+        ))
+        dwg.add(dwg.text(
+            "Search playlists...",
+            insert=(50, y + 28),
+            fill=self.colors['secondary'],
+            style='font-family: SF Pro Text; font-size: 15px'
+        ))
+        
+        # Playlists section
+        y += 74
+        dwg.add(dwg.text(
+            "My Playlists",
+            insert=(20, y),
+            fill=self.colors['text'],
+            style='font-family: SF Pro Text; font-size: 17px; font-weight: 600'
+        ))
+        
+        # Playlist grid
+        y += 20
+        with self.list_viewport(
+            dwg, y, 120, 100, item_count, scroll_offset
+        ) as (items, window):
+            for i, item_y in window:
+                # Card with playlist cover
+                self.add_component(
+                    dwg, 'list_card', (20, item_y), parent=items,
+                    width=self.screen_width - 40, height=100, media=(100, 100)
+                )
+                # Playlist info
+                items.add(dwg.text(
+                    f"Playlist {i+1}",
+                    insert=(140, item_y + 30),
+                    fill=self.colors['text'],
+                    style='font-family: SF Pro Text; font-size: 15px; font-weight: 600'
+                ))
+                items.add(dwg.text(
+                    f"{(i+1)*10} tracks",
+                    insert=(140, item_y + 50),
+                    fill=self.colors['secondary'],
+                    style='font-family: SF Pro Text; font-size: 13px'
+                ))
+            
+        return dwg
+
+    def create_user_favorites_screen(self, item_count=5, scroll_offset=0):
+        """Create user favorites screen wireframe"""
+        dwg = self.create_base_screen("favorites")
+        self.add_nav_bar(dwg, "Favorites")
+        
+        # Tabs
+        y = 88
+        tabs = ['Tracks', 'Artists', 'Playlists']
+        tab_width = self.screen_width / len(tabs)
+        for i, tab in enumerate(tabs):
+            # Tab background
+            dwg.add(dwg.rect(
+                (i * tab_width, y),
+                (tab_width, 44),
+                fill=self.colors['surface'] if i == 0 else 'none',
+                stroke=self.colors['border']
+            ))
+            # Tab text
+            dwg.add(dwg.text(
+                tab,
+                insert=(i * tab_width + tab_width/2, y + 28),
+                text_anchor='middle',
+                fill=self.colors['primary'] if i == 0 else self.colors['secondary'],
+                style='font-family: SF Pro Text; font-size: 15px'
+            ))
+        
+        # Favorites list
+        y = 152
+        with self.list_viewport(
+            dwg, y, 70, 60, item_count, scroll_offset
+        ) as (items, window):
+            for i, item_y in window:
+                # Card with track/artist image and favorite icon
+                self.add_component(
+                    dwg, 'list_card', (20, item_y), parent=items,
+                    width=self.screen_width - 40, height=60,
+                    media=(60, 60), action='favorite'
+                )
+                # Info
+                items.add(dwg.text(
+                    f"Track {i+1}",
+                    insert=(100, item_y + 25),
+                    fill=self.colors['text'],
+                    style='font-family: SF Pro Text; font-size: 15px; font-weight: 600'
+                ))
+                items.add(dwg.text(
+                    "Artist Name",
+                    insert=(100, item_y + 45),
+                    fill=self.colors['secondary'],
+                    style='font-family: SF Pro Text; font-size: 13px'
+                ))
+        
+        return dwg
+    def create_user_analytics_screen(self, item_count=3, scroll_offset=0):
+        """Create user analytics screen wireframe"""
+        dwg = self.create_base_screen("user_analytics")
+        self.add_nav_bar(dwg, "My Stats")
+        
+        # Listening Stats
+        y = 108
+        dwg.add(dwg.text(
+            "Listening Activity",
+            insert=(20, y),
+            fill=self.colors['text'],
+            style='font-family: SF Pro Text; font-size: 17px; font-weight: 600'
+        ))
+        
+        # Stats cards
+        stats = [
+            {'label': 'Hours Listened', 'value': '24.5'},
+            {'label': 'Artists', 'value': '12'},
+            {'label': 'Playlists', 'value': '5'}
+        ]
+        
+        y += 30
+        for i, stat in enumerate(stats):
+            x = 20 + i*(self.screen_width/3 - 20)
+            dwg.add(dwg.rect(
+                (x, y),
+                ((self.screen_width/3 - 30), 80),
+                rx=8, ry=8,
+                fill=self.colors['surface']
+            ))
+            # Stat value
+            dwg.add(dwg.text(
+                stat['value'],
+                insert=(x + (self.screen_width/3 - 30)/2, y + 35),
+                text_anchor='middle',
+                fill=self.colors['text'],
+                style='font-family: SF Pro Text; font-size: 24px; font-weight: bold'
+            ))
+            # Stat label
+            dwg.add(dwg.text(
+                stat['label'],
+                insert=(x + (self.screen_width/3 - 30)/2, y + 60),
+                text_anchor='middle',
+                fill=self.colors['secondary'],
+                style='font-family: SF Pro Text; font-size: 13px'
+            ))
+        
+        # Top Artists section
+        y += 120
+        dwg.add(dwg.text(
+            "Top Artists",
+            insert=(20, y),
+            fill=self.colors['text'],
+            style='font-family: SF Pro Text; font-size: 15px'
+        ))
+        
+        # Artist list
+        y += 20
+        with self.list_viewport(
+            dwg, y, 70, 60, item_count, scroll_offset
+        ) as (items, window):
+            for i, item_y in window:
+                # Card with artist image
+                self.add_component(
+                    dwg, 'list_card', (20, item_y), parent=items,
+                    width=self.screen_width - 40, height=60, avatar=(30, 30, 25)
+                )
+                # Artist info
+                items.add(dwg.text(
+                    f"Artist {i+1}",
+                    insert=(90, item_y + 25),
+                    fill=self.colors['text'],
+                    style='font-family: SF Pro Text; font-size: 15px; font-weight: 600'
+                ))
+                items.add(dwg.text(
+                    f"{item_count - i} hours listened",
+                    insert=(90, item_y + 45),
+                    fill=self.colors['secondary'],
+                    style='font-family: SF Pro Text; font-size: 13px'
+                ))
+        
+        return dwg
+
+    def create_user_profile_screen(self):
+        """Create user profile screen wireframe"""
+        return PLANS['user_profile'].run(self)
+
+    def create_user_profile_screenb(self, item_count=3, scroll_offset=0):
+        """Create user profile screen wireframe with recent activity"""
+        return PLANS['user_profile_activity'].run(
+            self, item_count=item_count, scroll_offset=scroll_offset
+        )
+
+    def create_user_preferences_screen(self):
+        """Create user preferences screen wireframe"""
+        dwg = self.create_base_screen("preferences")
+        self.add_nav_bar(dwg, "Preferences")
+        
+        # Music preferences
+        y = 108
+        dwg.add(dwg.text(
+            "Music Preferences",
+            insert=(20, y),
+            fill=self.colors['text'],
+            style='font-family: SF Pro Text; font-size: 17px; font-weight: 600'
+        ))
+        
+        # Genre selection
+        y += 40
+        genres = ['Hip Hop', 'R&B', 'Pop', 'Rock']
+        for genre in genres:
+            # Outlined card with checkbox
+            self.add_component(
+                dwg, 'list_card', (20, y),
+                width=self.screen_width - 40, height=50,
+                outline=True, action='checkbox'
+            )
+            dwg.add(dwg.text(
+                genre,
+                insert=(40, y + 30),
+                fill=self.colors['text'],
+                style='font-family: SF Pro Text; font-size: 15px'
+            ))
+            y += 60
+        
+        # Save button
+        dwg.add(dwg.rect(
+            (20, self.screen_height - 80),
+            (self.screen_width - 40, 50),
+            rx=25, ry=25,
+            fill=self.colors['primary']
+        ))
+        dwg.add(dwg.text(
+            "Save Preferences",
+            insert=(self.screen_width/2, self.screen_height - 45),
+            text_anchor='middle',
+            fill='white',
+            style='font-family: SF Pro Text; font-size: 17px; font-weight: 600'
+        ))
+        
+        return dwg